@@ -1,6 +1,7 @@
 import argparse
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from agent0_handoff import send_to_agent1
@@ -27,6 +28,16 @@ def _resolve_api_key(cli_key: str | None) -> str | None:
     return config.get("DEEPSEEK_API_KEY")
 
 
+def _translate_path(path: Path, api_key: str, dry_run: bool):
+    """Translate one article's headline; returns the result or the TranslationError."""
+    try:
+        if path.suffix.lower() == ".json":
+            return translate_headline_json(path, api_key, dry_run=dry_run)
+        return translate_headline_md(path, api_key, dry_run=dry_run)
+    except TranslationError as exc:
+        return exc
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Agent 0: headline translation and intake.")
     parser.add_argument("--input-dir", help="Folder to scan for JSON/MD articles.")
@@ -42,6 +53,17 @@ def main() -> None:
     parser.add_argument("--emit-results-jsonl", help="Write results JSONL to this path.")
     parser.add_argument("--verbose", action="store_true", help="Verbose logging.")
     parser.add_argument("--api-key", help="DeepSeek API key override.")
+    parser.add_argument(
+        "--processed-index",
+        action="store_true",
+        help="Cache the processed folder listing in .agent0_index.json (local disks only).",
+    )
+    parser.add_argument(
+        "--translate-workers",
+        type=int,
+        default=4,
+        help="Headline translations to run concurrently (default: 4).",
+    )
     args = parser.parse_args()
 
     if not args.input_dir and not args.targets_file:
@@ -63,19 +85,22 @@ def main() -> None:
     else:
         all_paths = scan_articles(str(input_dir))[: args.max_files]
     unique, duplicates, already_processed = detect_duplicates(
-        all_paths, processed_dir or (input_dir / "processed")
+        all_paths, processed_dir or (input_dir / "processed"), use_index=args.processed_index
     )
 
     translated_results = []
     processed_count = 0
     translated_count = 0
     unchanged_count = 0
-    for path in unique:
-        try:
-            if path.suffix.lower() == ".json":
-                result = translate_headline_json(path, api_key, dry_run=args.dry_run)
-            else:
-                result = translate_headline_md(path, api_key, dry_run=args.dry_run)
+    # Each headline is at most one blocking DeepSeek call, so overlap them;
+    # results still come back, and are reported, in scan order
+    workers = max(1, min(args.translate_workers, len(unique) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outcomes = executor.map(lambda path: _translate_path(path, api_key, args.dry_run), unique)
+        for path, result in zip(unique, outcomes):
+            if isinstance(result, TranslationError):
+                print(f"Translation failed for {path}: {result}")
+                continue
             translated_results.append(result)
             processed_count += 1
             if result.translated:
@@ -87,8 +112,6 @@ def main() -> None:
                     f"Processed: {path} -> {result.headline_en_gb} "
                     f"(source: {result.headline_source}, lang: {result.language}, conf: {result.language_confidence:.2f})"
                 )
-        except TranslationError as exc:
-            print(f"Translation failed for {path}: {exc}")
 
     if not translated_results:
         print("No new files to send.")
@@ -510,6 +510,7 @@ async def api_process_url(request: Request, background_tasks: BackgroundTasks) -
                 "status": "queued",
                 "progress": {"total": 1, "success": 0, "failed": 0, "skipped": 0},
                 "articles": {file_path: {"status": "pending"}},
+                "cancel_event": threading.Event(),
             }
         emit_status(run_uuid, "running", RUN_STATE[run_uuid]["progress"])
         emit_article(run_uuid, file_path, status="pending")
@@ -556,6 +557,7 @@ def api_run(request: RunRequest, background_tasks: BackgroundTasks) -> dict:
             "status": "queued",
             "progress": {"total": len(request.file_paths), "success": 0, "failed": 0, "skipped": 0},
             "articles": {path: {"status": "pending"} for path in request.file_paths},
+            "cancel_event": threading.Event(),
         }
     emit_status(run_uuid, "running", RUN_STATE[run_uuid]["progress"])
     for path in request.file_paths:
@@ -693,6 +695,9 @@ def api_cancel_run(run_id: str) -> dict:
         # Mark as cancelled in state
         state["status"] = "cancelled"
         state["cancelled"] = True
+        cancel_event = state.get("cancel_event")
+        if cancel_event is not None:
+            cancel_event.set()
 
     # Update database
     with get_conn() as conn:
@@ -1183,6 +1188,9 @@ def _process_run(run_uuid: str, db_run_id: int, file_paths: list[str]) -> None:
             (str(log_path), db_run_id),
         )
     summary = {"total": len(file_paths), "success": 0, "failed": 0, "skipped": 0}
+    with RUN_LOCK:
+        state = RUN_STATE.get(run_uuid)
+        cancel_event = state.get("cancel_event") if state else None
     try:
         summary = run_pipeline_stream(
             file_paths,
@@ -1192,6 +1200,7 @@ def _process_run(run_uuid: str, db_run_id: int, file_paths: list[str]) -> None:
             _emit_log,
             _emit_status,
             _emit_article,
+            cancel_event=cancel_event,
         )
     except Exception as exc:
         emit_log(run_uuid, "error", f"Run failed: {exc}")
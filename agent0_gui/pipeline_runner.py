@@ -4,8 +4,9 @@ import re
 import subprocess
 import sys
 import tempfile
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -13,6 +14,11 @@ from .db import get_conn
 from .settings import get_settings
 from config import load_config, save_config
 
+# Project root directory (parent of agent0_gui)
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_PROJECT_ROOT_STR = str(_PROJECT_ROOT)
+_MAIN_PY = str(_PROJECT_ROOT / "main.py")
+
 
 def now_iso() -> str:
     """Return current UTC time in ISO format."""
@@ -72,11 +78,8 @@ def _process_single_article(
 
     with get_conn() as conn:
         conn.execute(
-            """
-            INSERT INTO run_items (run_id, file_path, status, errors)
-            VALUES (?, ?, ?, ?)
-            """,
-            (db_run_id, file_path, "running", json.dumps([])),
+            "UPDATE run_items SET status = ? WHERE run_id = ? AND file_path = ?",
+            ("running", db_run_id, file_path),
         )
 
     wp_post_id = None
@@ -84,17 +87,12 @@ def _process_single_article(
     link_report = None
     errors = []
 
-    # Get the project root directory (parent of agent0_gui)
-    project_root = Path(__file__).resolve().parent.parent
-    main_py = project_root / "main.py"
-    
-    cmd = [sys.executable, str(main_py), "--input-path", file_path, "--non-interactive"]
+    cmd = [sys.executable, _MAIN_PY, "--input-path", file_path, "--non-interactive"]
     env = dict(os.environ)
     env["AGENT0_RUN_ID"] = run_uuid
     env["PYTHONUNBUFFERED"] = "1"
     
     # Pass config values to subprocess (critical for Cloud Run)
-    from config import load_config
     config = load_config()
     config_keys = [
         "GEMINI_API_KEY", "DEEPSEEK_API_KEY", "WP_BASE_URL", "WP_USERNAME",
@@ -107,7 +105,7 @@ def _process_single_article(
         if key in config and config[key] is not None:
             env[key] = str(config[key])
     emit_log(run_uuid, "info", f"Worker command: {' '.join(cmd)}", stage="worker", article_id=article_id)
-    emit_log(run_uuid, "info", f"Worker working directory: {project_root}", stage="worker", article_id=article_id)
+    emit_log(run_uuid, "info", f"Worker working directory: {_PROJECT_ROOT_STR}", stage="worker", article_id=article_id)
     emit_log(run_uuid, "info", f"Worker output → {log_path}", stage="worker", article_id=article_id)
 
     # Check if file exists
@@ -118,7 +116,7 @@ def _process_single_article(
     else:
         try:
             emit_log(run_uuid, "info", "Starting subprocess...", stage="worker", article_id=article_id)
-            returncode = subprocess.call(cmd, stdout=log_handle, stderr=log_handle, env=env, cwd=str(project_root))
+            returncode = subprocess.call(cmd, stdout=log_handle, stderr=log_handle, env=env, cwd=_PROJECT_ROOT_STR)
             log_handle.flush()
             emit_log(run_uuid, "info", f"Subprocess completed with code {returncode}", stage="worker", article_id=article_id)
             wp_post_id, wp_link = _extract_wp_from_log(log_path)
@@ -218,9 +216,18 @@ def _process_single_article(
 
                 conn.execute(
                     """
-                    INSERT OR REPLACE INTO published_articles
+                    INSERT INTO published_articles
                     (file_path, headline, english_headline, wp_post_id, wp_url, published_at, fingerprint, meta_title, primary_keyword, llm_model)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(file_path, wp_post_id) DO UPDATE SET
+                        headline = excluded.headline,
+                        english_headline = excluded.english_headline,
+                        wp_url = excluded.wp_url,
+                        published_at = excluded.published_at,
+                        fingerprint = excluded.fingerprint,
+                        meta_title = excluded.meta_title,
+                        primary_keyword = excluded.primary_keyword,
+                        llm_model = excluded.llm_model
                     """,
                     (file_path, headline, english_headline, wp_post_id, wp_link, now_iso(), fingerprint, meta_title, primary_keyword, llm_model),
                 )
@@ -231,17 +238,9 @@ def _process_single_article(
     return {"status": status, "wp_post_id": wp_post_id, "wp_link": wp_link, "errors": errors}
 
 
-def _is_run_cancelled(run_uuid: str) -> bool:
+def _is_run_cancelled(cancel_event: threading.Event | None) -> bool:
     """Check if a run has been cancelled."""
-    try:
-        from .app import RUN_STATE, RUN_LOCK
-        with RUN_LOCK:
-            state = RUN_STATE.get(run_uuid)
-            if state and state.get("cancelled"):
-                return True
-    except ImportError:
-        pass
-    return False
+    return bool(cancel_event and cancel_event.is_set())
 
 
 def run_pipeline_stream(
@@ -252,6 +251,7 @@ def run_pipeline_stream(
     emit_log,
     emit_status,
     emit_article,
+    cancel_event: threading.Event | None = None,
 ) -> dict:
     settings = get_settings()
     config = load_config()
@@ -294,57 +294,78 @@ def run_pipeline_stream(
     log_handle = log_path.open("ab")
 
     # Mark all articles as pending
+    with get_conn() as conn:
+        conn.executemany(
+            "INSERT INTO run_items (run_id, file_path, status, errors) VALUES (?, ?, ?, '[]')",
+            [(db_run_id, file_path, "pending") for file_path in file_paths],
+        )
     for file_path in file_paths:
         emit_article(run_uuid, file_path, status="pending")
 
     # Process articles in parallel (5 at a time)
-    emit_log(run_uuid, "info", f"Starting parallel processing of {total} articles (max 2 concurrent)", stage="start")
+    max_workers = 2
+    emit_log(run_uuid, "info", f"Starting parallel processing of {total} articles (max {max_workers} concurrent)", stage="start")
 
     try:
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            # Submit all tasks
-            futures = {
-                executor.submit(
-                    _process_single_article,
-                    file_path,
-                    run_uuid,
-                    db_run_id,
-                    log_handle,
-                    log_path,
-                    emit_log,
-                    emit_article,
-                ): file_path
-                for file_path in file_paths
-            }
-
-            # Process completed tasks as they finish
-            for future in as_completed(futures):
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Only keep max_workers articles in flight so a cancel stops
+            # dispatch immediately instead of draining a pre-filled queue.
+            pending_paths = iter(file_paths)
+            inflight: dict[Future, str] = {}
+            cancelled = False
+
+            def _top_up() -> None:
+                while len(inflight) < max_workers:
+                    file_path = next(pending_paths, None)
+                    if file_path is None:
+                        return
+                    future = executor.submit(
+                        _process_single_article,
+                        file_path,
+                        run_uuid,
+                        db_run_id,
+                        log_handle,
+                        log_path,
+                        emit_log,
+                        emit_article,
+                    )
+                    inflight[future] = file_path
+
+            _top_up()
+            while inflight:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                run_status = "cancelled" if cancelled else "running"
+                for future in done:
+                    file_path = inflight.pop(future)
+                    try:
+                        result = future.result()
+                        if result["status"] == "success":
+                            summary["success"] += 1
+                        else:
+                            summary["failed"] += 1
+                        emit_status(run_uuid, run_status, summary)
+                    except Exception as exc:
+                        emit_log(run_uuid, "error", f"Article {file_path} generated exception: {exc}", stage="worker")
+                        summary["failed"] += 1
+                        emit_status(run_uuid, run_status, summary)
+
                 # Check for cancellation
-                if _is_run_cancelled(run_uuid):
+                if not cancelled and _is_run_cancelled(cancel_event):
+                    cancelled = True
                     emit_log(run_uuid, "warn", "Run cancelled, stopping processing", stage="cancel")
-                    # Cancel remaining futures
-                    for f in futures:
-                        f.cancel()
-                    summary["skipped"] = total - summary["success"] - summary["failed"]
+                    summary["skipped"] = total - summary["success"] - summary["failed"] - len(inflight)
                     emit_status(run_uuid, "cancelled", summary)
-                    break
-
-                file_path = futures[future]
-                try:
-                    result = future.result()
-                    if result["status"] == "success":
-                        summary["success"] += 1
-                    else:
-                        summary["failed"] += 1
-                    emit_status(run_uuid, "running", summary)
-                except Exception as exc:
-                    emit_log(run_uuid, "error", f"Article {file_path} generated exception: {exc}", stage="worker")
-                    summary["failed"] += 1
-                    emit_status(run_uuid, "running", summary)
+                if not cancelled:
+                    _top_up()
     finally:
         # Check if cancelled to emit correct final status
-        if _is_run_cancelled(run_uuid):
+        if _is_run_cancelled(cancel_event):
             final_status = "cancelled"
+            with get_conn() as conn:
+                conn.execute(
+                    "UPDATE run_items SET status = ? WHERE run_id = ? AND status = ?",
+                    ("skipped", db_run_id, "pending"),
+                )
         elif summary["failed"] == 0:
             final_status = "done"
         else:
@@ -5,9 +5,11 @@ from typing import Optional
 
 from agent0_gui.db import get_conn
 
+_BASE_DIR = Path(__file__).resolve().parent.parent
+
 
 # All available LLM prompt keys (matching keys used in resolve_prompt calls)
-PROMPT_KEYS = [
+PROMPT_KEYS: tuple[str, ...] = (
     "PROMPT_TRANSLATION_SYSTEM",
     "PROMPT_TRANSLATION_USER",
     "PROMPT_PRIMARY_SYSTEM",
@@ -24,7 +26,8 @@ PROMPT_KEYS = [
     "PROMPT_TAG_GEN_USER",
     "PROMPT_TAXONOMY_SYSTEM",
     "PROMPT_TAXONOMY_USER",
-]
+)
+_PROMPT_KEYS_SET = frozenset(PROMPT_KEYS)
 
 
 def get_active_profile() -> Optional[dict]:
@@ -169,22 +172,21 @@ def get_profile_prompt(profile_id: int, prompt_key: str) -> Optional[str]:
 def get_all_profile_prompts(profile_id: int) -> dict[str, dict]:
     """Get all prompts for a profile. Returns only customized ones with their model preferences."""
     with get_conn() as conn:
+        # Plain tuples: unpacked positionally, no per-column name lookups
+        conn.row_factory = None
         rows = conn.execute(
             "SELECT prompt_key, prompt_value, model_preference FROM profile_prompts WHERE profile_id = ?",
             (profile_id,)
         ).fetchall()
-        return {
-            row["prompt_key"]: {
-                "value": row["prompt_value"],
-                "model": row["model_preference"] or "gemini-2.0-flash-exp"
-            }
-            for row in rows
-        }
+    return {
+        key: {"value": value, "model": model or "gemini-2.0-flash-exp"}
+        for key, value, model in rows
+    }
 
 
 def set_profile_prompt(profile_id: int, prompt_key: str, prompt_value: str, model_preference: str = None) -> None:
     """Set/update a prompt for a profile with optional model preference."""
-    if prompt_key not in PROMPT_KEYS:
+    if prompt_key not in _PROMPT_KEYS_SET:
         raise ValueError(f"Invalid prompt key: {prompt_key}. Must be one of: {PROMPT_KEYS}")
 
     with get_conn() as conn:
@@ -230,13 +232,13 @@ def get_profile_directories(profile_id: Optional[int] = None) -> dict[str, Path]
 
     if not profile:
         # Fallback to defaults
-        base_dir = Path(__file__).resolve().parent.parent
+        base_dir = _BASE_DIR
         return {
             "input_dir": base_dir / "current",
             "output_dir": base_dir / "output"
         }
 
-    base_dir = Path(__file__).resolve().parent.parent
+    base_dir = _BASE_DIR
 
     # Resolve directory paths
     input_dir = base_dir / profile["input_dir"]
@@ -1,30 +1,98 @@
 """Quick Article Creation from URLs, Images, or Text."""
-import json
 import re
 import tempfile
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 from io import BytesIO
 
 import requests
-from PIL import Image
+from PIL import Image, ImageOps
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import dumps_json
+
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:  # pragma: no cover
+    _HTML_PARSER = 'html.parser'
+
+try:
+    import tesserocr
+except ImportError:  # pragma: no cover
+    tesserocr = None
+
+_WS_RE = re.compile(r'\n\s*\n+')
+_SAFE_RE = re.compile(r'[^a-z0-9]+')
+
+# Shared session so repeated fetches reuse pooled TCP/TLS connections
+_SESSION = requests.Session()
+_SESSION.headers['User-Agent'] = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+_ADAPTER = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=2, backoff_factor=0.3))
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+# In-process tesseract engine (tesserocr), created on first use and shared
+_OCR_API = None
+_OCR_LOCK = threading.Lock()
+
+
+_NO_CONTENT_RANK = 6
+
+
+def _content_rank(tag) -> int:
+    """Rank a tag as the main content container; lower wins.
+
+    Order matches the old selector list: article, main, .content, #content,
+    .post, .entry-content.
+    """
+    if tag.name == 'article':
+        return 0
+    if tag.name == 'main':
+        return 1
+    classes = tag.get('class') or ()
+    if 'content' in classes:
+        return 2
+    if tag.get('id') == 'content':
+        return 3
+    if 'post' in classes:
+        return 4
+    if 'entry-content' in classes:
+        return 5
+    return _NO_CONTENT_RANK
+
+
+def _find_content(soup):
+    """Find the best content container in a single pass over the document."""
+    best = None
+    best_rank = _NO_CONTENT_RANK
+    for tag in soup.descendants:
+        if tag.name is None:
+            continue
+        rank = _content_rank(tag)
+        if rank < best_rank:
+            best, best_rank = tag, rank
+            if rank == 0:
+                break
+    return best
 
 
 def extract_text_from_url(url: str) -> dict:
     """Extract text content from a URL."""
     try:
-        from bs4 import BeautifulSoup
+        from bs4 import BeautifulSoup, SoupStrainer
 
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=30)
+        response = _SESSION.get(url, timeout=30)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Only <title> and the body subtree are ever read; skip the rest of <head>
+        strainer = SoupStrainer(['title', 'article', 'main', 'body', 'div'])
+        soup = BeautifulSoup(response.content, _HTML_PARSER, parse_only=strainer)
 
-        # Remove script and style elements
+        # Remove script and style elements (inline ones survive the strainer)
         for script in soup(["script", "style"]):
             script.decompose()
 
@@ -33,12 +101,7 @@ def extract_text_from_url(url: str) -> dict:
         title_text = title.get_text().strip() if title else ""
 
         # Get main content (try common content containers)
-        content_selectors = ['article', 'main', '.content', '#content', '.post', '.entry-content']
-        content = None
-        for selector in content_selectors:
-            content = soup.select_one(selector)
-            if content:
-                break
+        content = _find_content(soup)
 
         if not content:
             content = soup.find('body')
@@ -47,7 +110,7 @@ def extract_text_from_url(url: str) -> dict:
         text = content.get_text(separator='\n', strip=True) if content else ""
 
         # Clean up excessive whitespace
-        text = re.sub(r'\n\s*\n+', '\n\n', text)
+        text = _WS_RE.sub('\n\n', text)
 
         return {
             "source_type": "url",
@@ -65,20 +128,33 @@ def extract_text_from_url(url: str) -> dict:
         }
 
 
+def _ocr_with_tesserocr(image: Image.Image) -> str:
+    """OCR via a resident tesserocr engine so language models load only once."""
+    global _OCR_API
+    with _OCR_LOCK:
+        if _OCR_API is None:
+            _OCR_API = tesserocr.PyTessBaseAPI(lang='eng+spa', psm=tesserocr.PSM.SINGLE_BLOCK)
+        _OCR_API.SetImage(image)
+        return _OCR_API.GetUTF8Text()
+
+
 def extract_text_from_image(image_data: bytes) -> dict:
     """Extract text from an image using OCR."""
     try:
-        import pytesseract
-
         # Open image from bytes
         image = Image.open(BytesIO(image_data))
 
-        # Convert to RGB if necessary
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
+        # Tesseract binarises internally; hand it a single-channel image with
+        # stretched contrast instead of three RGB channels
+        image = ImageOps.autocontrast(image.convert('L'))
+
+        # Perform OCR (--psm 6: treat the image as one uniform block of text)
+        if tesserocr is not None:
+            text = _ocr_with_tesserocr(image)
+        else:
+            import pytesseract
 
-        # Perform OCR
-        text = pytesseract.image_to_string(image, lang='eng+spa')
+            text = pytesseract.image_to_string(image, lang='eng+spa', config='--psm 6')
 
         return {
             "source_type": "image",
@@ -122,6 +198,7 @@ def create_article_json(
     # Generate timestamp and fingerprint
     now = datetime.now(timezone.utc)
     timestamp = now.isoformat()
+    epoch = now.timestamp()
 
     # Extract a headline from title or content
     headline = title if title else content.split('\n')[0][:200]
@@ -137,7 +214,7 @@ def create_article_json(
         "date_time": timestamp,
         "created_at": timestamp,
         "quick_article": True,
-        "fingerprint": f"quick_{source_type}_{now.timestamp()}"
+        "fingerprint": f"quick_{source_type}_{epoch}"
     }
 
     # Use output_dir if provided, otherwise create temp directory
@@ -150,13 +227,12 @@ def create_article_json(
         target_dir = temp_dir
 
     # Create filename
-    safe_headline = re.sub(r'[^a-z0-9]+', '_', headline.lower())[:50]
-    filename = f"quick_{safe_headline}_{int(now.timestamp())}.json"
+    safe_headline = _SAFE_RE.sub('_', headline.lower())[:50]
+    filename = f"quick_{safe_headline}_{int(epoch)}.json"
     file_path = target_dir / filename
 
     # Write JSON file
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(article_data, f, indent=2, ensure_ascii=False)
+    file_path.write_bytes(dumps_json(article_data, indent=True))
 
     return file_path
 
@@ -1,16 +1,33 @@
 import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime, timezone
+from itertools import islice
 
 from agent0_scanner import scan_articles
 from agent0_translator import extract_headline_from_path, translate_headline_json, translate_headline_md
 from agent0_utils import extract_article_no
+from config import load_config, loads_json
 
 from .db import get_conn
 from .fingerprint import compute_fingerprint
 
 
+_TRAIL_NUM_RE = re.compile(r'\s+\d+$')
+# Accented characters used for language sniffing. Catalan shares é/í/ó/ú/ü
+# with Spanish, so only the characters Spanish lacks mark a headline as Catalan.
+_ES_SET = frozenset('áéíóúñü')
+_CA_SET = frozenset('àèòïç')
+_ACCENT_SET = _ES_SET | _CA_SET
+_TRANSLATABLE_SUFFIXES = frozenset({".json", ".md", ".markdown"})
+# Concurrent DeepSeek calls during a scan; kept low to stay under rate limits
+_TRANSLATE_WORKERS = 8
+_ENGLISH_WORDS = frozenset({'the', 'and', 'for', 'with', 'from', 'to', 'in', 'on', 'at'})
+
+
 def now_iso() -> str:
     """Return current UTC time in ISO format."""
     return datetime.now(timezone.utc).isoformat()
@@ -30,26 +47,21 @@ class ScanItem:
     fingerprint: str
 
 
-def _load_headline_en(path: Path) -> str:
-    """Load English headline from cache or file. Returns empty string if not translated."""
+def _load_headline_en(path: Path, cache: dict[str, str]) -> str:
+    """Load English headline from cache or file. Returns empty string if not translated.
+
+    ``cache`` maps file paths to cached headlines, preloaded once per scan.
+    """
     try:
         # First check cache
-        with get_conn() as conn:
-            row = conn.execute(
-                "SELECT headline_en_gb FROM headline_cache WHERE file_path = ?",
-                (str(path),),
-            ).fetchone()
-            if row and row["headline_en_gb"]:
-                return row["headline_en_gb"]
+        cached = cache.get(str(path))
+        if cached:
+            return cached
         
         # Then check if file has been translated
         if path.suffix.lower() == ".json":
             try:
-                content = path.read_text(encoding="utf-8").strip()
-                if not content:
-                    print(f"[WARNING] Empty JSON file during scan: {path}")
-                    return ""
-                data = json.loads(content)
+                data = loads_json(path.read_bytes())
                 # Only return headline_en_gb if it exists and is different from original
                 headline_en = data.get("headline_en_gb", "").strip()
                 if headline_en:
@@ -57,66 +69,115 @@ def _load_headline_en(path: Path) -> str:
                 # File hasn't been translated yet - return empty to signal this
                 return ""
             except json.JSONDecodeError as e:
-                print(f"[WARNING] Invalid JSON during scan: {path} - {e}")
+                if not e.doc.strip():
+                    print(f"[WARNING] Empty JSON file during scan: {path}")
+                else:
+                    print(f"[WARNING] Invalid JSON during scan: {path} - {e}")
                 return ""
         elif path.suffix.lower() in {".md", ".markdown"}:
-            # Extract title from markdown frontmatter
-            content = path.read_text(encoding="utf-8")
-            lines = content.splitlines()
+            # Extract title from markdown frontmatter (only the first 20 lines matter)
+            with path.open(encoding="utf-8") as handle:
+                lines = list(islice(handle, 20))
             if len(lines) >= 3 and lines[0].strip() == "---":
-                for idx in range(1, min(20, len(lines))):
-                    if lines[idx].strip() == "---":
+                for line in lines[1:]:
+                    if line.strip() == "---":
                         break
-                    if lines[idx].startswith("title:"):
-                        return lines[idx].split(":", 1)[1].strip()
+                    if line.startswith("title:"):
+                        return line.split(":", 1)[1].strip()
             return path.stem
-        content = path.read_text(encoding="utf-8")
         headline, _ = extract_headline_from_path(path)
         return headline
     except (json.JSONDecodeError, OSError):
         return ""
 
 
-def _is_scan_candidate(path: Path) -> bool:
+def _read_scan_entry(
+    path: Path,
+    stat: os.stat_result,
+    headline_cache: dict[str, str],
+    fingerprint_cache: dict[str, tuple[int, int, str, str]],
+) -> tuple[str, str, str, str, str, tuple | None]:
+    """Read the per-file scan data.
+
+    Returns (resolved_path, fingerprint, article_no, headline_raw, headline_en,
+    cache_row). ``stat`` is the result taken by the candidate filter. The
+    fingerprint and article number are reused from ``fingerprint_cache`` when
+    the file's mtime and size are unchanged; otherwise they are recomputed and
+    ``cache_row`` holds the fingerprint_cache row to store.
+    """
+    key = str(path)
+    cached = fingerprint_cache.get(key)
+    cache_row = None
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        fingerprint, article_no = cached[2], cached[3]
+    else:
+        fingerprint = compute_fingerprint(path)
+        article_no = extract_article_no(path)
+        cache_row = (key, stat.st_mtime_ns, stat.st_size, fingerprint, article_no)
+    headline_raw, _source = extract_headline_from_path(path)
+    headline_en = _load_headline_en(path, headline_cache)
+    return str(path.resolve()), fingerprint, article_no, headline_raw, headline_en, cache_row
+
+
+def _normalise_headline(headline: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing numbers like " 2"."""
+    normalized = " ".join(headline.lower().split())
+    end = len(normalized)
+    while end and normalized[end - 1].isdecimal():
+        end -= 1
+    return normalized[:end].rstrip()
+
+
+def _translate_headline(path: Path, api_key: str) -> str:
+    """Translate one file's headline via DeepSeek and return the en-GB text."""
+    if path.suffix.lower() == ".json":
+        result = translate_headline_json(path, api_key=api_key)
+    else:
+        result = translate_headline_md(path, api_key=api_key)
+    return result.headline_en_gb
+
+
+def _candidate_info(path: Path) -> os.stat_result | None:
+    """Return the file's stat result if it should be scanned, else None."""
     name = path.name.lower()
     # Accept both .json and .md/.markdown files
     is_json = name.endswith(".json")
     is_md = name.endswith(".md") or name.endswith(".markdown")
 
     if not (is_json or is_md):
-        return False
+        return None
 
     # Exclude specific patterns
     if name.endswith(".json.wp.json"):
-        return False
+        return None
     if name.endswith(".json.research.md"):
-        return False
+        return None
     if name in {
         "primary_source_log.jsonl",
         "primary_sources_registry.json",
         "used_keyphrases.json",
         "config.json",
     }:
-        return False
+        return None
     if ".research" in name:
-        return False
+        return None
     
     # Skip numbered duplicates from source (files ending with " 2.json", " 3.json", etc.)
-    import re
     stem = path.stem  # filename without extension
-    if re.search(r'\s+\d+$', stem):
+    if _TRAIL_NUM_RE.search(stem):
         print(f"[SCAN] Skipping numbered duplicate: {path.name}")
-        return False
+        return None
     
-    # Skip empty files
+    # Skip empty files (and files that vanished or cannot be read)
     try:
-        if path.stat().st_size == 0:
-            print(f"[SCAN] Skipping empty file: {path.name}")
-            return False
+        stat = path.stat()
     except OSError:
-        pass
+        return None
+    if stat.st_size == 0:
+        print(f"[SCAN] Skipping empty file: {path.name}")
+        return None
     
-    return True
+    return stat
 
 
 def scan_paths(paths: list[str], skip_duplicates: bool = True) -> list[ScanItem]:
@@ -128,7 +189,8 @@ def scan_paths(paths: list[str], skip_duplicates: bool = True) -> list[ScanItem]
     print(f"[SCAN] Found {len(all_paths)} total files")
     
     print(f"[SCAN] Filtering candidates...")
-    all_paths = [path for path in all_paths if _is_scan_candidate(path)]
+    candidates = [(path, stat) for path in all_paths if (stat := _candidate_info(path)) is not None]
+    all_paths = [path for path, _stat in candidates]
     print(f"[SCAN] {len(all_paths)} files passed candidate filter")
 
     print(f"[SCAN] Loading duplicate detection data from database...")
@@ -136,29 +198,87 @@ def scan_paths(paths: list[str], skip_duplicates: bool = True) -> list[ScanItem]
     published = set()
     published_paths = set()
     with get_conn() as conn:
+        # One read transaction so all lookups see the same snapshot
+        conn.execute("BEGIN")
+
         # Check processed table
-        rows = conn.execute("SELECT fingerprint FROM processed").fetchall()
-        processed = {row["fingerprint"] for row in rows}
+        processed = {row[0] for row in conn.execute("SELECT fingerprint FROM processed")}
         print(f"[SCAN] Loaded {len(processed)} processed fingerprints")
 
         # Check published_articles table
-        pub_rows = conn.execute("SELECT fingerprint, file_path FROM published_articles WHERE fingerprint IS NOT NULL").fetchall()
-        published = {row["fingerprint"] for row in pub_rows if row["fingerprint"]}
-        published_paths = {row["file_path"] for row in pub_rows if row["file_path"]}
+        for pub_fingerprint, pub_path in conn.execute(
+            "SELECT fingerprint, file_path FROM published_articles WHERE fingerprint IS NOT NULL"
+        ):
+            if pub_fingerprint:
+                published.add(pub_fingerprint)
+            if pub_path:
+                published_paths.add(pub_path)
         print(f"[SCAN] Loaded {len(published)} published fingerprints, {len(published_paths)} published paths")
 
+        # Preload translated headlines in one query instead of one per file
+        headline_cache = {
+            row["file_path"]: row["headline_en_gb"]
+            for row in conn.execute("SELECT file_path, headline_en_gb FROM headline_cache").fetchall()
+        }
+        fingerprint_cache = {
+            row[0]: (row[1], row[2], row[3], row[4])
+            for row in conn.execute(
+                "SELECT file_path, mtime_ns, size, fingerprint, article_no FROM fingerprint_cache"
+            )
+        }
+
     print(f"[SCAN] Processing articles and extracting headlines...")
+    scan_ts = now_iso()
     seen_names = set()
     seen_headlines = {}  # Map normalized headline to first file path
     items = []
     idx = 1
-    for i, path in enumerate(sorted(all_paths, key=lambda p: str(p).lower()), 1):
+    candidates.sort(key=lambda candidate: str(candidate[0]).lower())
+    sorted_paths = [path for path, _stat in candidates]
+    # File reads are independent and I/O-bound; fan them out, then apply the
+    # order-dependent duplicate checks serially below
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        entries = list(
+            executor.map(
+                lambda candidate: _read_scan_entry(*candidate, headline_cache, fingerprint_cache),
+                candidates,
+            )
+        )
+    fingerprint_updates = [entry[5] for entry in entries if entry[5] is not None]
+    headline_cache_writes: list[tuple[str, str, str]] = []
+    api_key = load_config().get("DEEPSEEK_API_KEY", "")
+
+    # Auto-translate headlines that are not in English yet. Each call is a
+    # DeepSeek round-trip, so run them concurrently rather than in the loop.
+    to_translate = [
+        path
+        for path, (_path_str, _fp, _no, headline_raw, headline_en, _row) in zip(sorted_paths, entries)
+        if api_key
+        and not headline_en
+        and headline_raw
+        and path.suffix.lower() in _TRANSLATABLE_SUFFIXES
+        # Check if headline looks like it needs translation (has Spanish/Catalan characters)
+        and not _ACCENT_SET.isdisjoint(headline_raw.lower())
+    ]
+    translations: dict[Path, str] = {}
+    if to_translate:
+        with ThreadPoolExecutor(max_workers=min(_TRANSLATE_WORKERS, len(to_translate))) as executor:
+            futures = {executor.submit(_translate_headline, path, api_key): path for path in to_translate}
+        for future, path in futures.items():
+            try:
+                translations[path] = future.result()
+            except Exception as e:
+                print(f"[SCAN] Translation failed for {path.name}: {e}")
+                # Continue with raw headline if translation fails
+
+    for i, (path, entry) in enumerate(zip(sorted_paths, entries), 1):
+        path_str, fingerprint, article_no, headline_raw, headline_en, _cache_row = entry
         # Progress update every 10 files
         if i % 10 == 0:
             print(f"[SCAN] Processing article {i}/{len(all_paths)}...")
         basename = path.name
-        path_str = str(path.resolve())
-        fingerprint = compute_fingerprint(path)
+        name_lc = basename.lower()
         duplicate_reason = None
         is_duplicate = False
 
@@ -171,55 +291,22 @@ def scan_paths(paths: list[str], skip_duplicates: bool = True) -> list[ScanItem]
         elif path_str in published_paths:
             is_duplicate = True
             duplicate_reason = "already published (by path)"
-        elif basename.lower() in seen_names:
+        elif name_lc in seen_names:
             is_duplicate = True
             duplicate_reason = "duplicate filename"
-        seen_names.add(basename.lower())
+        seen_names.add(name_lc)
 
-        headline_raw, _source = extract_headline_from_path(path)
-        headline_en = _load_headline_en(path)
-        
-        # Auto-translate headline if not in English
-        if not headline_en and headline_raw:
-            # Check if headline looks like it needs translation (has Spanish/Catalan characters)
-            import re
-            needs_translation = bool(re.search(r'[áéíóúñüàèòïç]', headline_raw.lower()))
-            if needs_translation:
-                try:
-                    from config import load_config
-                    config = load_config()
-                    api_key = config.get("DEEPSEEK_API_KEY", "")
-                    
-                    if api_key and path.suffix.lower() == ".json":
-                        result = translate_headline_json(path, api_key=api_key)
-                        headline_en = result.headline_en_gb
-                        # Cache the translation
-                        with get_conn() as conn:
-                            conn.execute(
-                                "INSERT OR REPLACE INTO headline_cache (file_path, headline_en_gb, updated_at) VALUES (?, ?, ?)",
-                                (str(path), headline_en, now_iso())
-                            )
-                        print(f"[SCAN] Auto-translated: {basename} -> {headline_en}")
-                    elif api_key and path.suffix.lower() in {".md", ".markdown"}:
-                        result = translate_headline_md(path, api_key=api_key)
-                        headline_en = result.headline_en_gb
-                        # Cache the translation
-                        with get_conn() as conn:
-                            conn.execute(
-                                "INSERT OR REPLACE INTO headline_cache (file_path, headline_en_gb, updated_at) VALUES (?, ?, ?)",
-                                (str(path), headline_en, now_iso())
-                            )
-                        print(f"[SCAN] Auto-translated: {basename} -> {headline_en}")
-                except Exception as e:
-                    print(f"[SCAN] Translation failed for {basename}: {e}")
-                    # Continue with raw headline if translation fails
+        # Use the auto-translated headline, if one was produced above
+        if path in translations:
+            headline_en = translations[path]
+            # Cache the translation (written in one batch after the loop)
+            headline_cache_writes.append((str(path), headline_en, scan_ts))
+            print(f"[SCAN] Auto-translated: {basename} -> {headline_en}")
         
         # Check for duplicate headlines (same content, different filename)
         if not is_duplicate and headline_raw:
             # Normalize headline for comparison (lowercase, remove extra spaces, remove trailing numbers)
-            import re
-            normalized = re.sub(r'\s+', ' ', headline_raw.lower().strip())
-            normalized = re.sub(r'\s*\d+\s*$', '', normalized)  # Remove trailing numbers like " 2"
+            normalized = _normalise_headline(headline_raw)
             
             if normalized in seen_headlines:
                 is_duplicate = True
@@ -235,25 +322,23 @@ def scan_paths(paths: list[str], skip_duplicates: bool = True) -> list[ScanItem]
             language = "en"
         elif headline_raw:
             # Not translated yet - detect from raw headline
-            import re
-            if re.search(r'[áéíóúñü]', headline_raw.lower()):
+            lowered = headline_raw.lower()
+            if not _ES_SET.isdisjoint(lowered):
                 language = "es"  # Spanish
-            elif re.search(r'[àèéíòóúïüç]', headline_raw.lower()):
+            elif not _CA_SET.isdisjoint(lowered):
                 language = "ca"  # Catalan
             else:
                 # Check if it looks like English
-                english_words = {'the', 'and', 'for', 'with', 'from', 'to', 'in', 'on', 'at'}
-                words = set(headline_raw.lower().split())
-                if words & english_words:
+                if not _ENGLISH_WORDS.isdisjoint(lowered.split()):
                     language = "en"
                 else:
                     language = "unknown"
 
         item = ScanItem(
             index=idx,
-            file_path=str(path.resolve()),
+            file_path=path_str,
             basename=basename,
-            article_no=extract_article_no(path),
+            article_no=article_no,
             headline_raw=headline_raw,
             headline_en_gb=headline_en or headline_raw,  # Show raw if not translated
             language=language,
@@ -265,6 +350,17 @@ def scan_paths(paths: list[str], skip_duplicates: bool = True) -> list[ScanItem]
             items.append(item)
             idx += 1
     
+    if fingerprint_updates or headline_cache_writes:
+        with get_conn() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO fingerprint_cache (file_path, mtime_ns, size, fingerprint, article_no) VALUES (?, ?, ?, ?, ?)",
+                fingerprint_updates,
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO headline_cache (file_path, headline_en_gb, updated_at) VALUES (?, ?, ?)",
+                headline_cache_writes,
+            )
+
     duplicates_found = len(all_paths) - len(items)
     print(f"[SCAN] ✓ Scan complete: {len(items)} articles ready, {duplicates_found} duplicates skipped")
     return items
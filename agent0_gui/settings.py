@@ -1,7 +1,9 @@
+import copy
 import json
+from functools import lru_cache
 from typing import Any
 
-from config import load_config, save_config
+from config import config_version, load_config, save_config
 import prompts
 
 
@@ -17,6 +19,7 @@ DEFAULT_SETTINGS = {
 }
 
 
+@lru_cache(maxsize=1)
 def _prompt_map() -> dict:
     entries = {}
     for key in dir(prompts):
@@ -62,21 +65,25 @@ STAGE_ORDER = [
 ]
 
 
+_STAGE_PREFIX = {
+    "TRANSLATION": "translation",
+    "PRIMARY": "primary_source",
+    "RELATED": "related_articles",
+    "ARTICLE": "article_writer",
+    "LINK": "link_validation",
+    "PUBLISH": "publishing",
+}
+# No prefix is a prefix of another, so at most one slice length can match
+_STAGE_PREFIX_LENGTHS = tuple(sorted({len(prefix) for prefix in _STAGE_PREFIX}))
+
+
 def _stage_from_key(key: str) -> str:
     if "HEADLINE" in key:
         return "translation"
-    if key.startswith("TRANSLATION"):
-        return "translation"
-    if key.startswith("PRIMARY"):
-        return "primary_source"
-    if key.startswith("RELATED"):
-        return "related_articles"
-    if key.startswith("ARTICLE"):
-        return "article_writer"
-    if key.startswith("LINK"):
-        return "link_validation"
-    if key.startswith("PUBLISH"):
-        return "publishing"
+    for length in _STAGE_PREFIX_LENGTHS:
+        stage = _STAGE_PREFIX.get(key[:length])
+        if stage:
+            return stage
     return "publishing"
 
 
@@ -87,6 +94,13 @@ def _display_name(stage_key: str) -> str:
 
 
 def get_settings() -> dict[str, Any]:
+    """Return settings, rebuilding them only when config.json has changed or been saved."""
+    return copy.deepcopy(_build_settings(config_version()))
+
+
+@lru_cache(maxsize=1)
+def _build_settings(_version: tuple[int, int, int] | None) -> dict[str, Any]:
+    """Settings derived from config; keyed on the config file version."""
     config = load_config()
     prompts_default = _prompt_map()
     prompts_current = _apply_prompt_overrides(config, prompts_default)
@@ -3,36 +3,92 @@ import os
 import re
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from config import loads_json
+
+
+_RE_WP_FIELD = re.compile(r"^[ \t]*- (?:ID:(?P<id>.*)|Link:(?P<link>.*))$", re.MULTILINE)
+_RE_URL = re.compile(r"https?://[^\s]+")
+_RE_LINK_REPORT = re.compile(r"^LINK_VALIDATION_REPORT:(.*)$", re.MULTILINE)
+
 
 def _parse_wp_result(stdout: str) -> tuple[int | None, str | None]:
     post_id = None
     link = None
-    for line in stdout.splitlines():
-        if line.strip().startswith("- ID:"):
+    # If a field is printed more than once, the last occurrence wins
+    for match in _RE_WP_FIELD.finditer(stdout):
+        raw_id = match.group("id")
+        if raw_id is not None:
             try:
-                post_id = int(line.split(":", 1)[1].strip())
+                post_id = int(raw_id.strip())
             except ValueError:
                 pass
-        if line.strip().startswith("- Link:"):
-            link = line.split(":", 1)[1].strip()
+        else:
+            link = match.group("link").strip()
     if not link:
-        match = re.search(r"https?://[^\s]+", stdout)
+        match = _RE_URL.search(stdout)
         if match:
             link = match.group(0)
     return post_id, link
 
 
 def _parse_link_report(stdout: str) -> dict | None:
-    for line in stdout.splitlines():
-        if line.startswith("LINK_VALIDATION_REPORT:"):
-            raw = line.split(":", 1)[1].strip()
-            try:
-                return json.loads(raw)
-            except json.JSONDecodeError:
-                return None
-    return None
+    match = _RE_LINK_REPORT.search(stdout)
+    if not match:
+        return None
+    raw = match.group(1).strip()
+    try:
+        return loads_json(raw.encode("utf-8"))
+    except json.JSONDecodeError:
+        return None
+
+
+def _default_concurrency() -> int:
+    try:
+        return max(1, int(os.environ.get("AGENT0_CONCURRENCY", "2")))
+    except ValueError:
+        return 2
+
+
+def _run_agent1(
+    path: Path,
+    agent1_command: list[str] | None,
+    verbose: bool,
+    env: dict[str, str],
+) -> dict:
+    cmd = agent1_command or ["python3", "main.py", "--input-path", str(path), "--non-interactive"]
+    if verbose:
+        print(f"Handing off to Agent 1: {' '.join(cmd)}")
+    start = time.time()
+    try:
+        proc = subprocess.run(cmd, check=False, capture_output=True, text=True, env=env)
+        duration = time.time() - start
+        post_id, link = _parse_wp_result(proc.stdout)
+        link_report = _parse_link_report(proc.stdout)
+        status = "success" if proc.returncode == 0 else "failed"
+        errors = []
+        if proc.stderr:
+            errors.append(proc.stderr.strip())
+        return {
+            "status": status,
+            "wp_post_id": post_id,
+            "wp_link": link,
+            "link_report": link_report,
+            "errors": errors,
+            "duration_s": round(duration, 2),
+        }
+    except OSError as exc:
+        duration = time.time() - start
+        return {
+            "status": "failed",
+            "wp_post_id": None,
+            "wp_link": None,
+            "link_report": None,
+            "errors": [str(exc)],
+            "duration_s": round(duration, 2),
+        }
 
 
 def send_to_agent1(
@@ -41,50 +97,32 @@ def send_to_agent1(
     dry_run: bool = False,
     verbose: bool = False,
     run_id: str | None = None,
+    max_workers: int | None = None,
 ) -> dict[Path, dict]:
-    results: dict[Path, dict] = {}
-    for path in paths:
-        if dry_run:
-            results[path] = {
+    """Hand each path to Agent 1, running up to ``max_workers`` at once.
+
+    ``max_workers`` defaults to $AGENT0_CONCURRENCY, or 2 (the GUI's limit).
+    Results are keyed by path in the order given.
+    """
+    if dry_run:
+        return {
+            path: {
                 "status": "dry_run",
                 "wp_post_id": None,
                 "wp_link": None,
                 "errors": [],
                 "duration_s": 0.0,
             }
-            continue
-        cmd = agent1_command or ["python3", "main.py", "--input-path", str(path), "--non-interactive"]
-        if verbose:
-            print(f"Handing off to Agent 1: {' '.join(cmd)}")
-        start = time.time()
-        try:
-            env = os.environ.copy()
-            if run_id:
-                env["AGENT0_RUN_ID"] = str(run_id)
-            proc = subprocess.run(cmd, check=False, capture_output=True, text=True, env=env)
-            duration = time.time() - start
-            post_id, link = _parse_wp_result(proc.stdout)
-            link_report = _parse_link_report(proc.stdout)
-            status = "success" if proc.returncode == 0 else "failed"
-            errors = []
-            if proc.stderr:
-                errors.append(proc.stderr.strip())
-            results[path] = {
-                "status": status,
-                "wp_post_id": post_id,
-                "wp_link": link,
-                "link_report": link_report,
-                "errors": errors,
-                "duration_s": round(duration, 2),
-            }
-        except OSError as exc:
-            duration = time.time() - start
-            results[path] = {
-                "status": "failed",
-                "wp_post_id": None,
-                "wp_link": None,
-                "link_report": None,
-                "errors": [str(exc)],
-                "duration_s": round(duration, 2),
-            }
-    return results
+            for path in paths
+        }
+    if not paths:
+        return {}
+    # Built once and shared: subprocess only reads it
+    env = os.environ.copy()
+    if run_id:
+        env["AGENT0_RUN_ID"] = str(run_id)
+    workers = min(max_workers or _default_concurrency(), len(paths))
+    # Each hand-off is a blocking subprocess, so threads overlap them fine
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outcomes = executor.map(lambda path: _run_agent1(path, agent1_command, verbose, env), paths)
+        return dict(zip(paths, outcomes))
@@ -1,6 +1,44 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import time
-from typing import Callable, Optional
+from typing import Callable, Iterator, Optional
+
+
+_ARTICLE_SUFFIXES = frozenset({".json", ".md"})
+_SKIP_DIRS = frozenset({"processed", "sources"})
+# Optional sidecar index of the processed tree, so detect_duplicates only
+# re-lists directories that changed since the last run. Off by default:
+# cloud/FUSE mounts (e.g. Google Drive) do not reliably bump directory mtimes
+_PROCESSED_INDEX_NAME = ".agent0_index.json"
+_PROCESSED_INDEX_VERSION = 1
+_INDEX_MTIME_SLACK_NS = 2_000_000_000
+
+
+def _scandir_walk(root: Path, recursive: bool) -> Iterator[os.DirEntry]:
+    """Yield every directory entry under ``root`` using os.scandir.
+
+    File types come from the directory listing itself, so no extra stat() is
+    needed per entry. "processed" and "sources" directories are yielded but
+    not descended into.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            # Unreadable directories are skipped, as glob()/rglob() did
+            continue
+        with it:
+            for entry in it:
+                yield entry
+                if (
+                    recursive
+                    and entry.is_dir(follow_symlinks=False)
+                    and entry.name.lower() not in _SKIP_DIRS
+                ):
+                    stack.append(entry.path)
 
 
 def scan_articles(
@@ -45,10 +83,13 @@ def scan_articles(
             "recursive": recursive
         })
     
-    # Use glob() for immediate directory only, rglob() for recursive
-    iterator = root.rglob("*") if recursive else root.glob("*")
-    
-    for path in iterator:
+    # Everything below a processed/sources directory is skipped, root included
+    if _SKIP_DIRS.isdisjoint(part.lower() for part in root.parts) and root.is_dir():
+        iterator = _scandir_walk(root, recursive)
+    else:
+        iterator = iter(())
+
+    for entry in iterator:
         # Safety check: timeout
         if time.time() - start_time > timeout_seconds:
             print(f"[WARNING] Scan timeout after {timeout_seconds}s. Found {len(paths)} articles from {scanned_count} files.")
@@ -60,15 +101,11 @@ def scan_articles(
             print(f"[WARNING] Reached file scan limit ({max_files}). Found {len(paths)} articles.")
             break
         
-        if not path.is_file():
+        if os.path.splitext(entry.name)[1].lower() not in _ARTICLE_SUFFIXES:
             continue
-        # Skip processed and sources directories
-        path_parts_lower = {part.lower() for part in path.parts}
-        if "processed" in path_parts_lower or "sources" in path_parts_lower:
+        if not entry.is_file() or entry.name == _PROCESSED_INDEX_NAME:
             continue
-        if path.suffix.lower() not in {".json", ".md"}:
-            continue
-        paths.append(path)
+        paths.append(Path(entry.path))
         
         # Progress feedback for large scans
         if scanned_count % 100 == 0:
@@ -99,13 +136,108 @@ def scan_articles(
     return paths
 
 
-def detect_duplicates(paths: list[Path], processed_dir: str | Path) -> tuple[list[Path], list[Path], list[Path]]:
+def _load_processed_index(processed_dir: Path) -> dict:
+    """Load the cached listing of the processed tree, or {} if missing/corrupt."""
+    try:
+        data = json.loads((processed_dir / _PROCESSED_INDEX_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _PROCESSED_INDEX_VERSION:
+        return {}
+    return data
+
+
+def _save_processed_index(processed_dir: Path, scanned_ns: int, listings: dict) -> None:
+    index = {"version": _PROCESSED_INDEX_VERSION, "scanned_ns": scanned_ns, "dirs": listings}
+    try:
+        # Rewritten in place: replacing the file would bump the directory mtime
+        (processed_dir / _PROCESSED_INDEX_NAME).write_text(json.dumps(index), encoding="utf-8")
+    except OSError as exc:
+        print(f"[WARNING] Could not write processed index: {exc}")
+
+
+def _list_dir(directory: str, cached: list | None, trusted_before_ns: int) -> list | None:
+    """Return [mtime_ns, lowercased file names, subdirectory paths] for one directory.
+
+    Adding, removing or renaming an entry bumps the directory's mtime, so a
+    cached listing with the same mtime is still valid. Listings whose mtime is
+    too close to the previous scan are re-read in case a change landed in the
+    same timestamp tick. Returns None if the directory cannot be read.
+    """
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+    if cached and cached[0] == mtime_ns and mtime_ns < trusted_before_ns:
+        return cached
+    names = []
+    subdirs = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file() and entry.name != _PROCESSED_INDEX_NAME:
+                    names.append(entry.name.lower())
+    except OSError:
+        return None
+    return [mtime_ns, names, subdirs]
+
+
+def _collect_file_names(
+    root: Path, index: dict, wanted: set[str], keep_listings: bool = False, max_workers: int = 8
+) -> tuple[set[str], dict | None]:
+    """Find which of the lowercased ``wanted`` names exist as files under ``root``.
+
+    Directories unchanged since ``index`` was written reuse its listing; the
+    rest are read on a thread pool, one tree level at a time. Returns the
+    matching names and, with ``keep_listings``, the per-directory listings to
+    store in the next index (otherwise None, so no listing outlives its level).
+    """
+    cached_dirs = index.get("dirs") or {}
+    trusted_before_ns = index.get("scanned_ns", 0) - _INDEX_MTIME_SLACK_NS
+    names: set[str] = set()
+    listings: dict[str, list] | None = {} if keep_listings else None
+    frontier = [str(root)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while frontier:
+            next_frontier = []
+            results = executor.map(
+                lambda directory: _list_dir(directory, cached_dirs.get(directory), trusted_before_ns),
+                frontier,
+            )
+            for directory, listing in zip(frontier, results):
+                if listing is None:
+                    continue
+                if listings is not None:
+                    listings[directory] = listing
+                names.update(wanted.intersection(listing[1]))
+                next_frontier.extend(listing[2])
+            frontier = next_frontier
+    return names, listings
+
+
+def detect_duplicates(
+    paths: list[Path], processed_dir: str | Path, use_index: bool = False
+) -> tuple[list[Path], list[Path], list[Path]]:
+    """Split ``paths`` into unique, duplicate and already-processed articles.
+
+    With ``use_index`` the processed tree's listing is cached in
+    ``.agent0_index.json`` inside ``processed_dir`` and only directories whose
+    mtime changed are re-read. Only enable it on local filesystems that
+    update directory mtimes reliably.
+    """
     processed = Path(processed_dir)
     processed_names = set()
-    if processed.exists():
-        for path in processed.rglob("*"):
-            if path.is_file():
-                processed_names.add(path.name.lower())
+    if processed.is_dir():
+        scanned_ns = time.time_ns()
+        # Only the candidates' names can match, so keep just those rather
+        # than a set of every file name in the archive
+        wanted = {path.name.lower() for path in paths}
+        index = _load_processed_index(processed) if use_index else {}
+        processed_names, listings = _collect_file_names(processed, index, wanted, keep_listings=use_index)
+        if use_index:
+            _save_processed_index(processed, scanned_ns, listings)
 
     unique = []
     duplicates = []
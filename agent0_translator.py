@@ -1,14 +1,21 @@
 import json
 import re
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from agent0_utils import now_iso, sidecar_meta_path
 from deepseek_client import call_deepseek_chat, DeepSeekError
-from config import load_config
+from config import config_version, dumps_json, load_config, loads_json
 from llm_clients import LLMError, parse_json_response
 
 
+# langdetect loads its language profiles lazily into a module global, which
+# is not safe to race when headlines are translated on several threads
+_LANGDETECT_LOCK = threading.Lock()
+
+
 class TranslationError(Exception):
     pass
 
@@ -63,6 +70,15 @@ _LANG_HINTS = {
 }
 _LANG_THRESHOLD = 0.7
 
+_ES_DIACRITICS = frozenset("áéíóúñü")
+_CA_DIACRITICS = frozenset("àèéíòóúïüç")
+_RE_WORDS = re.compile(r"\b[a-zàèéíòóúïüçñ]+\b")
+_RE_MD_H1 = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+# Bytes form for in-place edits; stops at \r so CRLF line endings survive
+_RE_MD_H1_BYTES = re.compile(rb"^#\s+([^\r\n]+)", re.MULTILINE)
+_RE_WS = re.compile(r"\s+")
+_RE_TRAILING_PUNCT = re.compile(r"[!?\\.]{2,}$")
+
 
 def needs_translation(lang_code: str | None) -> bool:
     if not lang_code:
@@ -74,16 +90,21 @@ def _infer_language_simple(text: str) -> tuple[str, float]:
     if not text:
         return "unknown", 0.0
     lower = text.lower()
-    if re.search(r"[áéíóúñü]", lower):
+    if not _ES_DIACRITICS.isdisjoint(lower):
         return "es", 0.8
-    if re.search(r"[àèéíòóúïüç]", lower):
+    if not _CA_DIACRITICS.isdisjoint(lower):
         return "ca", 0.8
-    words = re.findall(r"\b[a-zàèéíòóúïüçñ]+\b", lower)
+    words = _RE_WORDS.findall(lower)
     if not words:
         return "unknown", 0.0
-    spanish_hits = sum(1 for w in words if w in _SPANISH_HINTS)
-    catalan_hits = sum(1 for w in words if w in _CATALAN_HINTS)
-    english_hits = sum(1 for w in words if w in _ENGLISH_HINTS)
+    spanish_hits = catalan_hits = english_hits = 0
+    for w in words:
+        if w in _SPANISH_HINTS:
+            spanish_hits += 1
+        if w in _CATALAN_HINTS:
+            catalan_hits += 1
+        if w in _ENGLISH_HINTS:
+            english_hits += 1
     if spanish_hits >= 2 and spanish_hits >= english_hits and spanish_hits >= catalan_hits:
         return "es", min(1.0, 0.5 + spanish_hits * 0.1)
     if catalan_hits >= 2 and catalan_hits >= english_hits and catalan_hits >= spanish_hits:
@@ -120,8 +141,15 @@ def _detect_language_llm(text: str, api_key: str, model_name: str) -> tuple[str,
     return lang, conf_val
 
 
-def _translate_headline(text: str, api_key: str, model_name: str) -> str:
+@lru_cache(maxsize=1)
+def _headline_prompt_templates(_version: tuple[int, int, int] | None) -> tuple[str, tuple[str, ...], bool]:
+    """Headline prompts from config; keyed on the config file version.
+
+    The user template comes back pre-split on <HEADLINE>, so filling it in is
+    a single join. The flag is True when either prompt is overridden in config.
+    """
     config = load_config()
+    customised = bool(config.get("PROMPT_HEADLINE_SYSTEM") or config.get("PROMPT_HEADLINE_USER"))
     system_prompt = config.get("PROMPT_HEADLINE_SYSTEM") or (
         "You translate news headlines into British English (en-GB). "
         "Use British spelling: organise (not organize), colour (not color), centre (not center), etc. "
@@ -134,14 +162,69 @@ def _translate_headline(text: str, api_key: str, model_name: str) -> str:
         "-re endings (centre, theatre), -ence endings (defence, offence).\n\n"
         "Headline:\n<HEADLINE>"
     )
-    user_prompt = user_prompt_template.replace("<HEADLINE>", text)
-    raw = call_deepseek_chat(model_name, system_prompt, user_prompt, api_key)
+    return system_prompt, tuple(user_prompt_template.split("<HEADLINE>")), customised
+
+
+def _headline_prompts(text: str) -> tuple[str, str]:
+    system_prompt, user_prompt_parts, _ = _headline_prompt_templates(config_version())
+    return system_prompt, text.join(user_prompt_parts)
+
+
+def _headline_prompts_customised() -> bool:
+    return _headline_prompt_templates(config_version())[2]
+
+
+def _clean_headline_line(raw: str) -> str:
     line = raw.strip().splitlines()[0].strip()
     line = line.strip("\"'“”")
-    line = re.sub(r"[!?\\.]{2,}$", "", line).strip()
+    line = _RE_TRAILING_PUNCT.sub("", line).strip()
     return line
 
 
+def _translate_headline(text: str, api_key: str, model_name: str) -> str:
+    system_prompt, user_prompt = _headline_prompts(text)
+    raw = call_deepseek_chat(model_name, system_prompt, user_prompt, api_key)
+    return _clean_headline_line(raw)
+
+
+def _detect_and_translate_llm(text: str, api_key: str, model_name: str) -> tuple[str, float, str]:
+    """Detect the headline language and translate it in one DeepSeek request.
+
+    Uses its own JSON prompt, since the default headline prompts ask for a
+    single plain line; _assess_headline only calls it when those prompts are
+    not overridden in config. The translation is empty if the model judged the
+    headline English. A reply that is not valid JSON falls back to the
+    separate detection call, leaving the translation to _translate_headline.
+    """
+    system_prompt = (
+        "You detect the language of a news headline and translate it into British English (en-GB). "
+        "Use British spelling: organise (not organize), colour (not color), centre (not center), etc. "
+        "Respond only with valid JSON."
+    )
+    user_prompt = (
+        "Identify the language of this headline. If it is not English, translate it into British "
+        "English (en-GB): keep it newsy, preserve proper nouns, and do not add facts.\n"
+        "Return JSON only: {\"language\": \"en|es|ca|other\", \"confidence\": 0-1, "
+        "\"translation\": \"<en-GB headline, or empty string if already English>\"}\n\n"
+        f"Headline:\n{text}"
+    )
+    raw = call_deepseek_chat(model_name, system_prompt, user_prompt, api_key)
+    try:
+        payload = parse_json_response(raw)
+    except LLMError:
+        lang, conf_val = _detect_language_llm(text, api_key, model_name)
+        return lang, conf_val, ""
+    lang = str(payload.get("language") or "other").lower()
+    try:
+        conf_val = float(payload.get("confidence"))
+    except (TypeError, ValueError):
+        conf_val = 0.0
+    translation = str(payload.get("translation") or "").strip()
+    if translation:
+        translation = _clean_headline_line(translation)
+    return lang, conf_val, translation
+
+
 def _headline_from_filename(path: Path) -> str:
     stem = path.stem
     # Strip number prefix with dash separator (e.g., "001-Title" -> "Title")
@@ -156,7 +239,7 @@ def _headline_from_filename(path: Path) -> str:
             stem = stem.split("_", 1)[1]
     # Convert remaining underscores and dashes to spaces
     stem = stem.replace("_", " ").replace("-", " ")
-    stem = re.sub(r"\s+", " ", stem).strip()
+    stem = _RE_WS.sub(" ", stem).strip()
     return stem
 
 
@@ -172,12 +255,8 @@ def extract_headline_source(data: dict, path: Path) -> tuple[str, str]:
     return fallback, "filename"
 
 
-def headline_needs_translation(
-    headline_raw: str,
-    lang_hint: str | None,
-    api_key: str,
-    model_name: str,
-) -> tuple[bool, str, float]:
+def _detect_language_local(headline_raw: str, lang_hint: str | None) -> tuple[bool, str, float] | None:
+    """Decide from the hint, langdetect or the heuristic; None if still unsure."""
     if lang_hint:
         normalised = _LANG_HINTS.get(lang_hint.strip().lower())
         if normalised == "en":
@@ -192,7 +271,8 @@ def headline_needs_translation(
 
     if detect_langs:
         try:
-            langs = detect_langs(headline_raw)
+            with _LANGDETECT_LOCK:
+                langs = detect_langs(headline_raw)
             if langs:
                 lang = langs[0].lang
                 conf = langs[0].prob
@@ -204,22 +284,85 @@ def headline_needs_translation(
     lang, conf = _infer_language_simple(headline_raw)
     if lang in {"en", "es", "ca"} and conf >= _LANG_THRESHOLD:
         return lang != "en", lang, conf
+    return None
 
-    lang, conf = _detect_language_llm(headline_raw, api_key, model_name)
+
+def _llm_verdict(lang: str, conf: float) -> tuple[bool, str, float]:
     if lang in {"en", "es", "ca"} and conf >= 0.6:
         return lang != "en", lang, conf
-
     return True, lang if lang else "unknown", conf
 
 
+def headline_needs_translation(
+    headline_raw: str,
+    lang_hint: str | None,
+    api_key: str,
+    model_name: str,
+) -> tuple[bool, str, float]:
+    local = _detect_language_local(headline_raw, lang_hint)
+    if local is not None:
+        return local
+    lang, conf = _detect_language_llm(headline_raw, api_key, model_name)
+    return _llm_verdict(lang, conf)
+
+
+def _assess_headline(
+    headline_raw: str,
+    lang_hint: str | None,
+    api_key: str,
+    model_name: str,
+) -> tuple[bool, str, float, str]:
+    """Like headline_needs_translation, plus any translation fetched on the way.
+
+    When the language has to be asked of the LLM, the translation is requested
+    in the same call; the fourth element is that translation, or "" if none
+    was fetched. With custom headline prompts configured, only the language is
+    asked for, so the translation still goes through those prompts.
+    """
+    local = _detect_language_local(headline_raw, lang_hint)
+    if local is not None:
+        return (*local, "")
+    if _headline_prompts_customised():
+        lang, conf = _detect_language_llm(headline_raw, api_key, model_name)
+        return (*_llm_verdict(lang, conf), "")
+    lang, conf, translation = _detect_and_translate_llm(headline_raw, api_key, model_name)
+    needs, lang, conf = _llm_verdict(lang, conf)
+    return needs, lang, conf, translation
+
+
+def _translate_if_needed(
+    headline: str,
+    lang_hint: str | None,
+    api_key: str,
+    model_name: str,
+) -> tuple[str, str, float, bool, str]:
+    """Return (headline_en, language, confidence, translated, model_used)."""
+    try:
+        needs_translate, lang_detected, lang_conf, prefetched = _assess_headline(
+            headline, lang_hint, api_key, model_name
+        )
+    except DeepSeekError as exc:
+        raise TranslationError(str(exc)) from exc
+
+    if not needs_translate:
+        return headline, lang_detected, lang_conf, False, "none"
+    if prefetched:
+        return prefetched, lang_detected, lang_conf, True, model_name
+    try:
+        headline_en = _translate_headline(headline, api_key, model_name)
+    except DeepSeekError as exc:
+        raise TranslationError(str(exc)) from exc
+    return headline_en, lang_detected, lang_conf, True, model_name
+
+
 def extract_headline_from_path(path: Path) -> tuple[str, str]:
     if path.suffix.lower() == ".json":
         try:
-            content = path.read_text(encoding="utf-8").strip()
-            if not content:
+            content = path.read_bytes()
+            if not content.strip():
                 print(f"[WARNING] Empty JSON file: {path}")
                 return _headline_from_filename(path), "filename"
-            data = json.loads(content)
+            data = loads_json(content)
             return extract_headline_source(data, path)
         except json.JSONDecodeError as e:
             print(f"[WARNING] Invalid JSON in {path}: {e}")
@@ -228,7 +371,7 @@ def extract_headline_from_path(path: Path) -> tuple[str, str]:
             print(f"[WARNING] Error reading {path}: {e}")
             return _headline_from_filename(path), "filename"
     content = path.read_text(encoding="utf-8")
-    match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
+    match = _RE_MD_H1.search(content)
     if match:
         return match.group(1).strip(), "md_h1"
     return _headline_from_filename(path), "filename"
@@ -241,31 +384,17 @@ def translate_headline_json(
     dry_run: bool = False,
 ) -> TranslationResult:
     try:
-        content = path.read_text(encoding="utf-8").strip()
-        if not content:
+        content = path.read_bytes()
+        if not content.strip():
             raise TranslationError(f"Empty JSON file: {path}")
-        data = json.loads(content)
+        data = loads_json(content)
     except json.JSONDecodeError as e:
         raise TranslationError(f"Invalid JSON in {path}: {e}") from e
     headline, source_field = extract_headline_source(data, path)
     lang_hint = (data.get("original_language") or "").strip()
-    try:
-        needs_translate, lang_detected, lang_conf = headline_needs_translation(
-            headline, lang_hint, api_key, model_name
-        )
-    except DeepSeekError as exc:
-        raise TranslationError(str(exc)) from exc
-
-    translated = False
-    model_used = "none"
-    headline_en = headline
-    if needs_translate:
-        try:
-            headline_en = _translate_headline(headline, api_key, model_name)
-            translated = True
-            model_used = model_name
-        except DeepSeekError as exc:
-            raise TranslationError(str(exc)) from exc
+    headline_en, lang_detected, lang_conf, translated, model_used = _translate_if_needed(
+        headline, lang_hint, api_key, model_name
+    )
 
     if not dry_run:
         data["headline_en_gb"] = headline_en
@@ -274,7 +403,7 @@ def translate_headline_json(
         data["agent0_language_confidence"] = round(float(lang_conf), 3)
         data["agent0_translated_at"] = now_iso()
         data["agent0_model"] = model_used
-        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        path.write_bytes(dumps_json(data, indent=True))
 
     return TranslationResult(
         path=path,
@@ -294,33 +423,19 @@ def translate_headline_md(
     model_name: str = "deepseek-chat",
     dry_run: bool = False,
 ) -> TranslationResult:
-    content = path.read_text(encoding="utf-8")
-    match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
+    # Work on the raw bytes: only the H1 is decoded, and the rewrite splices
+    # the new headline in without decoding/re-encoding the whole article
+    raw = path.read_bytes()
+    match = _RE_MD_H1_BYTES.search(raw)
     if not match:
         raise TranslationError("No H1 headline found in markdown.")
-    headline = match.group(1).strip()
-    lang_hint = None
-    try:
-        needs_translate, lang_detected, lang_conf = headline_needs_translation(
-            headline, lang_hint, api_key, model_name
-        )
-    except DeepSeekError as exc:
-        raise TranslationError(str(exc)) from exc
-
-    translated = False
-    model_used = "none"
-    headline_en = headline
-    if needs_translate:
-        try:
-            headline_en = _translate_headline(headline, api_key, model_name)
-            translated = True
-            model_used = model_name
-        except DeepSeekError as exc:
-            raise TranslationError(str(exc)) from exc
+    headline = match.group(1).decode("utf-8").strip()
+    headline_en, lang_detected, lang_conf, translated, model_used = _translate_if_needed(
+        headline, None, api_key, model_name
+    )
 
     if not dry_run:
-        updated = content[: match.start(1)] + headline_en + content[match.end(1) :]
-        path.write_text(updated, encoding="utf-8")
+        path.write_bytes(b"".join((raw[: match.start(1)], headline_en.encode("utf-8"), raw[match.end(1) :])))
         meta = {
             "headline_en_gb": headline_en,
             "agent0_headline_source_field": "md_h1",
@@ -329,10 +444,7 @@ def translate_headline_md(
             "agent0_translated_at": now_iso(),
             "agent0_model": model_used,
         }
-        sidecar_meta_path(path).write_text(
-            json.dumps(meta, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
+        sidecar_meta_path(path).write_bytes(dumps_json(meta, indent=True))
 
     return TranslationResult(
         path=path,
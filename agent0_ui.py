@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 from typing import Iterable
 
 try:
@@ -12,8 +13,10 @@ except ImportError:  # pragma: no cover
 
 from agent0_utils import slugify_headline
 
+_RE_SELECTION = re.compile(r"(\d+)(?:-(\d+))?")
 
-@dataclass
+
+@dataclass(slots=True)
 class ArticleItem:
     index: int
     article_no: str
@@ -25,6 +28,11 @@ class ArticleItem:
     needs_translation: bool
     is_duplicate: bool
     duplicate_reason: str | None = None
+    # Lowercased headline, computed once so filtering doesn't redo it per keystroke
+    headline_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.headline_lower = (self.headline_en_gb or "").lower()
 
 
 def _truncate(text: str, max_len: int) -> str:
@@ -38,13 +46,14 @@ def filter_items(
     filter_text: str | None,
     show_duplicates: bool,
 ) -> list[ArticleItem]:
-    filtered = items
-    if not show_duplicates:
-        filtered = [item for item in filtered if not item.is_duplicate]
-    if filter_text:
-        needle = filter_text.lower()
-        filtered = [item for item in filtered if needle in (item.headline_en_gb or "").lower()]
-    return filtered
+    if show_duplicates and not filter_text:
+        return items
+    needle = filter_text.lower() if filter_text else ""
+    return [
+        item
+        for item in items
+        if (show_duplicates or not item.is_duplicate) and needle in item.headline_lower
+    ]
 
 
 def render_table(
@@ -103,23 +112,18 @@ def parse_selection(text: str, max_index: int) -> list[int]:
         return []
     if text == "all":
         return list(range(1, max_index + 1))
-    indices: list[int] = []
+    indices: set[int] = set()
     for part in text.split(","):
-        part = part.strip()
-        if not part:
-            continue
-        if "-" in part:
-            start_str, end_str = part.split("-", 1)
-            if start_str.isdigit() and end_str.isdigit():
-                start = int(start_str)
-                end = int(end_str)
-                if start > end:
-                    start, end = end, start
-                indices.extend(range(start, end + 1))
+        match = _RE_SELECTION.fullmatch(part.strip())
+        if not match:
             continue
-        if part.isdigit():
-            indices.append(int(part))
-    return sorted({i for i in indices if 1 <= i <= max_index})
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else start
+        if start > end:
+            start, end = end, start
+        # Clip before expanding so huge ranges do not build huge lists
+        indices.update(range(max(start, 1), min(end, max_index) + 1))
+    return sorted(indices)
 
 
 def prompt_selection(
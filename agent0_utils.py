@@ -1,18 +1,23 @@
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
 
+_RE_WS = re.compile(r"\s+")
+_RE_SLUG_BAD = re.compile(r"[\\/:*?\"<>|]")
+
+
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
 def slugify_headline(text: str, max_len: int = 90) -> str:
-    cleaned = re.sub(r"\s+", " ", text or "").strip()
+    cleaned = _RE_WS.sub(" ", text or "").strip()
     cleaned = cleaned.strip("\"'“”")
     cleaned = cleaned.replace("\n", " ").strip()
-    cleaned = re.sub(r"[\\/:*?\"<>|]", "", cleaned)
+    cleaned = _RE_SLUG_BAD.sub("", cleaned)
     if len(cleaned) > max_len:
         cleaned = cleaned[:max_len].rstrip()
     return cleaned
@@ -42,12 +47,16 @@ def sidecar_meta_path(md_path: Path) -> Path:
     return md_path.with_suffix(md_path.suffix + ".meta.json")
 
 
+def _move_file(path: Path, destination: Path) -> Path:
+    shutil.move(str(path), str(destination))
+    return destination
+
+
 def move_to_processed(path: Path, input_dir: Path, processed_dir: Path) -> Path:
     rel = path.relative_to(input_dir)
     destination = processed_dir / rel
     destination.parent.mkdir(parents=True, exist_ok=True)
-    shutil.move(str(path), str(destination))
-    return destination
+    return _move_file(path, destination)
 
 
 def move_selected_files(
@@ -57,12 +66,17 @@ def move_selected_files(
     success_map: dict[Path, bool],
     dry_run: bool = False,
 ) -> list[Path]:
-    moved = []
-    for path in selected:
-        if not success_map.get(path):
-            continue
-        if dry_run:
-            continue
-        destination = move_to_processed(path, input_dir, processed_dir)
-        moved.append(destination)
-    return moved
+    if dry_run:
+        return []
+    pairs = [
+        (path, processed_dir / path.relative_to(input_dir))
+        for path in selected
+        if success_map.get(path)
+    ]
+    if not pairs:
+        return []
+    # Create each destination folder once, serially, then overlap the moves
+    for parent in {destination.parent for _path, destination in pairs}:
+        parent.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=min(8, len(pairs))) as executor:
+        return list(executor.map(lambda pair: _move_file(*pair), pairs))
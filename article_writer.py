@@ -1,7 +1,8 @@
-import json
 import re
 import unicodedata
+from functools import lru_cache
 
+from config import dumps_json
 from llm_clients import GeminiClient, LLMError, parse_json_response
 from prompts import resolve_prompt
 
@@ -97,37 +98,357 @@ AMERICAN_TO_BRITISH = {
 }
 
 
+def _trie_regex(words) -> str:
+    """Build a regex alternation for ``words`` with shared prefixes factored out.
+
+    The regex engine then walks the words like a trie: at each position it
+    follows one branch per character rather than trying every word in turn.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: dict) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A word ends here; longer words are tried first, \b picks the fit
+            return "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+# One pass over the text finds every American spelling. The leading
+# first-letter class lets most word starts fail before entering the trie.
+_BRITISH_FIRST_LETTERS = "".join(sorted({word[0] for word in AMERICAN_TO_BRITISH}))
+_BRITISH_RE = re.compile(
+    r"\b(?=[" + _BRITISH_FIRST_LETTERS + r"])(?:" + _trie_regex(AMERICAN_TO_BRITISH) + r")\b",
+    re.IGNORECASE,
+)
+
+
+_DOTTED_I_TO_I = str.maketrans({"İ": "i", "ı": "i"})
+
+
+# Lowercase, Title and UPPER forms of every spelling, so the common cases are
+# a single dict lookup
+_BRITISH_CASE_MAP = {
+    form(american): form(british)
+    for american, british in AMERICAN_TO_BRITISH.items()
+    for form in (str.lower, str.capitalize, str.upper)
+}
+
+
+def _british_replacement(match: re.Match) -> str:
+    """Return the British spelling, preserving the case of the original word."""
+    word = match.group(0)
+    british = _BRITISH_CASE_MAP.get(word)
+    if british is not None:
+        return british
+    # Mixed case, or IGNORECASE matching "ſ" for "s" and dotted/dotless I for "i"
+    british = AMERICAN_TO_BRITISH[word.translate(_DOTTED_I_TO_I).casefold()]
+    if word[0].isupper():
+        if word.isupper() and len(word) > 1:
+            # All caps: ORGANIZED -> ORGANISED
+            return british.upper()
+        # Title case: Organized -> Organised
+        return british.capitalize()
+    # lowercase: organized -> organised
+    return british
+
+
 def convert_to_british_english(text: str) -> str:
     """Convert American English spellings to British English."""
     if not text:
         return text
-
-    result = text
-
-    for american, british in AMERICAN_TO_BRITISH.items():
-        def replace_match(match):
-            """Preserve the case of the original word."""
-            word = match.group(0)
-            if word[0].isupper():
-                if word.isupper() and len(word) > 1:
-                    # All caps: ORGANIZED -> ORGANISED
-                    return british.upper()
-                else:
-                    # Title case: Organized -> Organised
-                    return british.capitalize()
-            else:
-                # lowercase: organized -> organised
-                return british
-
-        # Use a custom replacement function to preserve case
-        result = re.sub(
-            r'\b' + re.escape(american) + r'\b',
-            replace_match,
-            result,
-            flags=re.IGNORECASE
-        )
-
-    return result
+    return _BRITISH_RE.sub(_british_replacement, text)
+
+
+# Joins fields for one conversion pass; NULs are non-word characters, so
+# word boundaries at the field edges are unchanged
+_FIELD_SEPARATOR = "\x00\x00SEP\x00\x00"
+
+
+def _convert_fields_to_british(payload: dict, keys: tuple[str, ...]) -> None:
+    """Run convert_to_british_english over several payload fields in one pass."""
+    present = [key for key in keys if payload.get(key)]
+    values = [payload[key] for key in present]
+    if not values:
+        return
+    if any(_FIELD_SEPARATOR in value for value in values):
+        for key in present:
+            payload[key] = convert_to_british_english(payload[key])
+        return
+    converted = convert_to_british_english(_FIELD_SEPARATOR.join(values)).split(_FIELD_SEPARATOR)
+    payload.update(zip(present, converted))
+
+
+_ARTICLE_SYSTEM_MESSAGE = (
+    "You are a professional news journalist writing clear, modern articles for intelligent but busy readers.\n"
+    "You write in British English with clarity, flow, and readability as top priorities.\n"
+    "Your writing is factual, concrete, and accessible—like something published in a major newspaper, not a policy report.\n"
+    "You follow Yoast SEO best practices for focus keyphrase, meta title, meta description, headings and readability.\n"
+    "You respond ONLY with valid JSON and no extra commentary.\n"
+    "Do not fabricate facts. If a detail is unknown, leave it out."
+)
+
+_ARTICLE_USER_MESSAGE = (
+    "You will receive three JSON objects:\n"
+    "  1. The original scraped article metadata and raw body.\n"
+    "  2. A translation and analysis JSON.\n"
+    "  3. A primary source JSON describing the original official report or announcement.\n\n"
+    "Your tasks:\n"
+    "  1. Identify the most appropriate primary SEO keyphrase for this news story.\n"
+    "  2. Write a meta title (max ~60 chars) including the keyphrase near the start.\n"
+    "  3. Write a meta description (max ~145 chars), compelling and human, including the keyphrase once.\n"
+    "  4. Generate a slug for WordPress (lowercase, hyphen separated).\n"
+    "  5. Suggest 3-6 SEO-friendly tags.\n"
+    "  6. Write a short excerpt (1-2 sentences) summarising the story.\n"
+    "  7. Write a full WordPress-ready article using Gutenberg block markup:\n"
+    "     - Use Gutenberg block comments (<!-- wp:... -->).\n"
+    "     - Include exactly one H1 block for the title.\n"
+    "     - Begin with at least two paragraph blocks before the first H2 block.\n"
+    "     - Use H2 blocks for main sections and H3 blocks sparingly.\n"
+    "     - Use paragraph blocks for body text and include links inside paragraphs.\n"
+    "     - Minimum 300 words based on the primary source and key claims.\n"
+    "     - Written in British English for intelligent but busy readers.\n"
+    "     - Optimised for mobile readability.\n"
+    "     - Based on facts only; do not speculate.\n"
+    "     - Use the focus keyphrase in the first paragraph, at least one H2, and naturally throughout.\n\n"
+    "🔴 MANDATORY PRIMARY SOURCE LINK REQUIREMENT:\n"
+    "  - You MUST include at least ONE hyperlink to the PRIMARY SOURCE URL\n"
+    "  - The primary source URL is provided in the primary_source.url field of the PRIMARY SOURCE JSON\n"
+    "  - This is the ACTUAL SOURCE of the article's information - link to it naturally when citing data or facts\n"
+    "  - Example integrations:\n"
+    "    ✓ \"According to the <a href='[primary_source.url]'>official report</a>, the numbers show...\"\n"
+    "    ✓ \"The <a href='[primary_source.url]'>government announcement</a> confirmed that...\"\n"
+    "    ✓ \"Data from the <a href='[primary_source.url]'>survey results</a> revealed...\"\n"
+    "  - Place this link early in the article when first introducing key data or claims\n"
+    "  - If primary_source.url is null or empty, then DON'T add any external links (better no link than wrong link)\n\n"
+    "CRITICAL EXTERNAL LINKING RULES:\n"
+    "  - NEVER INVENT OR CONSTRUCT URLs - only use URLs that are explicitly provided in the input data\n"
+    "  - If a URL is not provided in the article data, primary source data, or analysis, DO NOT CREATE ONE\n"
+    "  - NEVER guess URL paths, filenames, or IDs - even if they seem logical\n"
+    "    ❌ FORBIDDEN: Constructing 'https://lamoncloa.gob.es/.../160126-afiliacion-extranjeros.aspx' from context\n"
+    "    ✓ CORRECT: Only link to the primary_source.url provided, or don't link at all\n"
+    "  - NEVER include links with placeholder IDs like 'XXXXX' or '/status/XXXXX'\n"
+    "  - NEVER link to generic homepages without a specific page:\n"
+    "    ❌ FORBIDDEN: https://www.icao.int/\n"
+    "    ❌ FORBIDDEN: https://www.example.com/\n"
+    "    ✓ ALLOWED: https://www.icao.int/security/safeguarding/pages/default.aspx (specific page)\n"
+    "  - If you mention an external organization but don't have a specific relevant URL, do NOT add a link\n"
+    "  - Only add external links if ALL of these are true:\n"
+    "    1. The URL was PROVIDED in the input data (not constructed by you)\n"
+    "    2. The URL is complete and specific (not just a domain homepage)\n"
+    "    3. The URL directly supports the specific claim being made\n"
+    "  - When referencing government reports, ministry statements, or official data:\n"
+    "    ✓ CORRECT: \"According to the Ministry of Inclusion, foreign workers now represent 14.1% of contributors.\"\n"
+    "    ❌ WRONG: \"<a href='https://lamoncloa.gob.es/...[invented path]'>According to the Ministry</a>...\"\n"
+    "  - When mentioning organizations for context, do NOT add generic homepage links:\n"
+    "    ✓ CORRECT: \"...as outlined by international aviation security protocols.\"\n"
+    "    ❌ WRONG: \"...from the <a href='https://www.icao.int/'>International Civil Aviation Organization</a>.\"\n"
+    "  - If you cannot find a specific, verified URL in the provided data, it's better to have NO link than an invented link\n\n"
+    "SOCIAL MEDIA LINKS (STRICT RULES):\n"
+    "  - NEVER construct Twitter/X URLs with guessed status IDs\n"
+    "    ❌ FORBIDDEN: https://x.com/salvadorilla/status/1748057288647704739 (if not in input data)\n"
+    "    ❌ FORBIDDEN: https://twitter.com/username/status/[any ID you think might be right]\n"
+    "  - Twitter/X status IDs are unique 18-19 digit numbers - you cannot guess them\n"
+    "  - If the article mentions a tweet/post but doesn't provide the exact URL, do NOT link to it\n"
+    "  - Same applies to Instagram, Facebook, LinkedIn - never construct social media URLs\n"
+    "  - If you want to reference a social media post:\n"
+    "    ✓ CORRECT: \"Illa posted on X announcing the meeting.\" (no link)\n"
+    "    ❌ WRONG: \"Illa <a href='https://x.com/salvadorilla/status/[made-up-id]'>posted on X</a> announcing the meeting.\"\n"
+    "  - ONLY link to social media if the EXACT URL is provided in the input data\n\n"
+    "CRITICAL WRITING RULES (Modern British Journalism):\n\n"
+    "1. OPENING SENTENCE:\n"
+    "   - Start with a strong, concrete fact that states the key impact on people\n"
+    "   - Example: \"One in three people using public transport in Barcelona now travels on a discounted or social ticket.\"\n"
+    "   - NOT: \"Barcelona's transport system has undergone significant changes...\"\n\n"
+    "2. PARAGRAPH STRUCTURE:\n"
+    "   - One idea per paragraph\n"
+    "   - Maximum 2-3 sentences per paragraph\n"
+    "   - Short, punchy, easy to scan on mobile\n\n"
+    "3. ACTIVE VOICE:\n"
+    "   - Put institutions and people at the start of sentences\n"
+    "   - Example: \"The government is using cheaper tickets to reduce car use.\"\n"
+    "   - NOT: \"Fare policy is being used as a lever to reduce car use.\"\n\n"
+    "4. SIMPLE LANGUAGE:\n"
+    "   - Use plain English over abstract academic wording\n"
+    "   - NEVER use: \"structural reconfiguration\", \"institutional message\", \"funding architecture\", \"lever\", \"ambition is to\"\n"
+    "   - Turn concepts into actions: \"The council plans to...\" not \"The ambition is to...\"\n\n"
+    "5. STATISTICS:\n"
+    "   - State the number first, then explain what it means\n"
+    "   - Example: \"33% of all passengers now use discounted fares. That shows subsidised travel is no longer marginal.\"\n\n"
+    "6. SENTENCE LENGTH:\n"
+    "   - If a sentence has more than one comma, split it\n"
+    "   - Aim for natural, spoken rhythm\n"
+    "   - Break up long, complex sentences\n\n"
+    "7. EXPLAIN POLICY SIMPLY:\n"
+    "   - Present funding or subsidies as if explaining to a commuter\n"
+    "   - Example: \"The State pays 20% of the discount. The Generalitat covers the remaining 30%.\"\n\n"
+    "8. SUBHEADINGS (H2/H3):\n"
+    "   - Must answer real questions readers would ask\n"
+    "   - Example: \"Who qualifies for these tickets?\", \"Who pays for the discounts?\", \"What's changing with ticket technology?\"\n"
+    "   - NOT: \"Policy Implementation Framework\" or \"Strategic Overview\"\n\n"
+    "9. TONE:\n"
+    "   - Confident, journalistic, factual\n"
+    "   - NO ceremonial or inflated language\n"
+    "   - NO academic framing\n"
+    "   - NEVER use: \"the objective is\", \"the ambition is\", \"this demonstrates that\"\n"
+    "   - NEVER use: \"marks a significant milestone\", \"in an exciting development\"\n\n"
+    "10. BRITISH ENGLISH SPELLING (MANDATORY):\n"
+    "    - ALWAYS use British spelling, NEVER American:\n"
+    "      ✓ organised, NOT organized\n"
+    "      ✓ recognised, NOT recognized\n"
+    "      ✓ emphasised, NOT emphasized\n"
+    "      ✓ realised, NOT realized\n"
+    "      ✓ specialised, NOT specialized\n"
+    "      ✓ characterised, NOT characterized\n"
+    "      ✓ prioritised, NOT prioritized\n"
+    "      ✓ maximised, NOT maximized\n"
+    "      ✓ minimised, NOT minimized\n"
+    "      ✓ authorised, NOT authorized\n"
+    "      ✓ legalised, NOT legalized\n"
+    "      ✓ finalised, NOT finalized\n"
+    "      ✓ analysed, NOT analyzed\n"
+    "      ✓ capitalised, NOT capitalized\n"
+    "      ✓ standardised, NOT standardized\n"
+    "      ✓ localised, NOT localized\n"
+    "      ✓ colour, NOT color\n"
+    "      ✓ favour, NOT favor\n"
+    "      ✓ labour, NOT labor\n"
+    "      ✓ behaviour, NOT behavior\n"
+    "      ✓ centre, NOT center\n"
+    "      ✓ metre, NOT meter (measurement)\n"
+    "      ✓ defence, NOT defense\n"
+    "      ✓ offence, NOT offense\n"
+    "      ✓ licence, NOT license (noun)\n"
+    "      ✓ travelling, NOT traveling\n"
+    "      ✓ cancelled, NOT canceled\n"
+    "      ✓ modelling, NOT modeling\n"
+    "      ✓ programme, NOT program (except for computer programs)\n"
+    "    - If in doubt, prefer the -ise/-isation form over -ize/-ization\n\n"
+    "11. BANNED PHRASES (NEVER USE THESE):\n"
+    "    ❌ \"have cause for celebration\"\n"
+    "    ❌ \"That debate has been building for months\"\n"
+    "    ❌ \"excited the community\"\n"
+    "    ❌ \"will be closely following\"\n"
+    "    ❌ \"structural reconfiguration\"\n"
+    "    ❌ \"institutional message\"\n"
+    "    ❌ \"funding architecture\"\n"
+    "    ❌ \"lever for change\"\n"
+    "    ❌ \"the ambition is to\"\n"
+    "    ❌ \"the objective is to\"\n"
+    "    ❌ \"this demonstrates that\"\n\n"
+    "12. CLOSING PARAGRAPH / CALL-TO-ACTION RULES:\n"
+    "    - NEVER end with generic \"For more information, visit [organization] website\" linking to a homepage\n"
+    "    - FORBIDDEN closing patterns:\n"
+    "      ❌ \"For more information on Barcelona's cultural venues, visit the Barcelona City Council website.\" (links to https://www.barcelona.cat/)\n"
+    "      ❌ \"Visit the official website for more details.\" (links to homepage)\n"
+    "      ❌ \"More information is available at [organization].\" (links to homepage)\n"
+    "    - ACCEPTABLE closing approaches (in order of preference):\n"
+    "      1. End with a relevant fact, quote, or forward-looking statement about the story\n"
+    "         ✓ \"The new measures will take effect from March 2026.\"\n"
+    "         ✓ \"Officials said further details would be announced in the coming weeks.\"\n"
+    "      2. If you have a SPECIFIC relevant link (not homepage), integrate it naturally:\n"
+    "         ✓ \"Full survey results are available in the <a href='https://example.com/reports/2026/survey.pdf'>official report</a>.\"\n"
+    "         ✓ \"The council has published the <a href='https://example.com/planning/2026/proposal'>detailed proposal</a> online.\"\n"
+    "      3. Provide context without any link:\n"
+    "         ✓ \"The Barcelona City Council maintains information on cultural venues and events.\"\n"
+    "         ✓ \"Further updates will be published on the official website.\"\n"
+    "    - NEVER add a closing paragraph just to include a link\n"
+    "    - The article should feel complete without needing a generic \"visit website\" CTA\n\n"
+    "FINAL CHECK:\n"
+    "  - The article must be easily readable on a phone\n"
+    "  - It must sound like something from The Guardian or BBC News, not a policy report\n"
+    "  - Every sentence should pass the \"would you say this out loud?\" test\n"
+    "  - The closing paragraph must NOT contain a generic homepage link\n\n"
+    "Example format:\n"
+    "<!-- wp:heading {\"level\":1} -->\n"
+    "<h1>Title here</h1>\n"
+    "<!-- /wp:heading -->\n\n"
+    "<!-- wp:paragraph -->\n"
+    "<p>Intro paragraph with keyphrase...</p>\n"
+    "<!-- /wp:paragraph -->\n\n"
+    "<!-- wp:heading {\"level\":2} -->\n"
+    "<h2>Section heading</h2>\n"
+    "<!-- /wp:heading -->\n\n"
+    "<!-- wp:paragraph -->\n"
+    "<p>Body text...</p>\n"
+    "<!-- /wp:paragraph -->\n\n"
+    "Return ONLY valid JSON in this exact structure:\n\n"
+    "{\n"
+    "  \"meta_title\": \"...\",\n"
+    "  \"meta_description\": \"...\",\n"
+    "  \"primary_keyword\": \"...\",\n"
+    "  \"slug\": \"...\",\n"
+    "  \"tags\": [\"...\", \"...\"],\n"
+    "  \"excerpt\": \"...\",\n"
+    "  \"wp_block_content\": \"...\"\n"
+    "}\n\n"
+    "Here is the original article JSON:\n"
+    "<ORIGINAL_ARTICLE_JSON_HERE>\n\n"
+    "Here is the translation & analysis JSON:\n"
+    "<ANALYSIS_JSON_HERE>\n\n"
+    "Here is the primary source JSON:\n"
+    "<PRIMARY_SOURCE_JSON_HERE>"
+)
+
+_RELATED_ARTICLES_INSTRUCTIONS = (
+    "\n\nYou will also receive a JSON object describing some existing articles from this site that should be referenced in the new article when appropriate.\n"
+    "For each entry, you will see: url, title, anchor_text, why_relevant, and suggested_insertion.\n\n"
+    "Please:\n"
+    "  - Weave up to 3 references into the article body in a natural way.\n"
+    "  - Use standard HTML anchor tags for each hyperlink, e.g.:\n"
+    "    <a href=\"URL\">anchor_text</a>\n"
+    "  - Place one link in the intro or early body if possible.\n"
+    "  - Do not over-link: at most one link per related article.\n\n"
+    "CRITICAL LINKING REQUIREMENTS:\n"
+    "  - Each related article link MUST be introduced with a UNIQUE phrase or sentence structure.\n"
+    "  - NEVER repeat the same linking pattern or sentence structure.\n"
+    "  - Vary your linking style for each reference:\n"
+    "    * First link: Natural contextual reference (e.g., \"The city previously addressed similar concerns about...\")\n"
+    "    * Second link: Background reference (e.g., \"This follows earlier action on...\")\n"
+    "    * Third link: Continuation reference (e.g., \"The issue connects to broader questions about...\")\n"
+    "  - Use different sentence structures and vocabulary for each link.\n"
+    "  - Avoid formulaic patterns like \"we covered it in...\" or \"as we reported in...\"\n"
+    "  - Make each link introduction flow naturally from the surrounding paragraph's topic.\n"
+    "  - If you cannot introduce a link naturally and uniquely, skip it rather than force it.\n\n"
+    "EXAMPLES OF LINKING VARIETY:\n"
+    "  ❌ BAD (repetitive - DO NOT DO THIS):\n"
+    "    \"That debate has been building for months — we covered it in streamlining municipal bureaucracy.\"\n"
+    "    \"That debate has been building for months — we covered it in scrutiny of public service operations.\"\n\n"
+    "  ✅ GOOD (varied - DO THIS):\n"
+    "    \"The city previously addressed similar concerns when streamlining municipal bureaucracy.\"\n"
+    "    \"This follows earlier scrutiny of public service operations, which raised questions about oversight.\"\n"
+    "    \"Related questions emerged during recent discussions about transparency requirements.\"\n\n"
+    "RELATED ARTICLES JSON:\n"
+)
+
+_PLACEHOLDER_RE = re.compile(
+    r"(<ORIGINAL_ARTICLE_JSON_HERE>|<ANALYSIS_JSON_HERE>|<PRIMARY_SOURCE_JSON_HERE>)"
+)
+
+
+def _dumps_prompt_json(value) -> str:
+    """Serialise an input blob for the prompt as indented, unescaped JSON."""
+    return dumps_json(_normalise_unicode(value), indent=True).decode("utf-8")
+
+
+@lru_cache(maxsize=8)
+def _split_user_template(template: str) -> tuple[str, ...]:
+    """Split a user prompt into alternating literal text and placeholder names.
+
+    The default template and any profile override are each split once, so
+    building a prompt is a single join instead of three full-string replaces.
+    """
+    return tuple(_PLACEHOLDER_RE.split(template))
 
 
 def build_gemini_article_prompt(
@@ -137,272 +458,63 @@ def build_gemini_article_prompt(
     related_articles: dict | None = None,
     prompt_overrides: dict | None = None,
 ) -> dict:
-    system_message = (
-        "You are a professional news journalist writing clear, modern articles for intelligent but busy readers.\n"
-        "You write in British English with clarity, flow, and readability as top priorities.\n"
-        "Your writing is factual, concrete, and accessible—like something published in a major newspaper, not a policy report.\n"
-        "You follow Yoast SEO best practices for focus keyphrase, meta title, meta description, headings and readability.\n"
-        "You respond ONLY with valid JSON and no extra commentary.\n"
-        "Do not fabricate facts. If a detail is unknown, leave it out."
-    )
-
-    original_json = json.dumps(_normalise_unicode(original_article), ensure_ascii=False, indent=2)
-    analysis_json = json.dumps(_normalise_unicode(analysis), ensure_ascii=False, indent=2)
-    primary_json = json.dumps(_normalise_unicode(primary_source), ensure_ascii=False, indent=2)
-
-    user_message = (
-        "You will receive three JSON objects:\n"
-        "  1. The original scraped article metadata and raw body.\n"
-        "  2. A translation and analysis JSON.\n"
-        "  3. A primary source JSON describing the original official report or announcement.\n\n"
-        "Your tasks:\n"
-        "  1. Identify the most appropriate primary SEO keyphrase for this news story.\n"
-        "  2. Write a meta title (max ~60 chars) including the keyphrase near the start.\n"
-        "  3. Write a meta description (max ~145 chars), compelling and human, including the keyphrase once.\n"
-        "  4. Generate a slug for WordPress (lowercase, hyphen separated).\n"
-        "  5. Suggest 3-6 SEO-friendly tags.\n"
-        "  6. Write a short excerpt (1-2 sentences) summarising the story.\n"
-        "  7. Write a full WordPress-ready article using Gutenberg block markup:\n"
-        "     - Use Gutenberg block comments (<!-- wp:... -->).\n"
-        "     - Include exactly one H1 block for the title.\n"
-        "     - Begin with at least two paragraph blocks before the first H2 block.\n"
-        "     - Use H2 blocks for main sections and H3 blocks sparingly.\n"
-        "     - Use paragraph blocks for body text and include links inside paragraphs.\n"
-        "     - Minimum 300 words based on the primary source and key claims.\n"
-        "     - Written in British English for intelligent but busy readers.\n"
-        "     - Optimised for mobile readability.\n"
-        "     - Based on facts only; do not speculate.\n"
-        "     - Use the focus keyphrase in the first paragraph, at least one H2, and naturally throughout.\n\n"
-        "🔴 MANDATORY PRIMARY SOURCE LINK REQUIREMENT:\n"
-        "  - You MUST include at least ONE hyperlink to the PRIMARY SOURCE URL\n"
-        "  - The primary source URL is provided in the primary_source.url field of the PRIMARY SOURCE JSON\n"
-        "  - This is the ACTUAL SOURCE of the article's information - link to it naturally when citing data or facts\n"
-        "  - Example integrations:\n"
-        "    ✓ \"According to the <a href='[primary_source.url]'>official report</a>, the numbers show...\"\n"
-        "    ✓ \"The <a href='[primary_source.url]'>government announcement</a> confirmed that...\"\n"
-        "    ✓ \"Data from the <a href='[primary_source.url]'>survey results</a> revealed...\"\n"
-        "  - Place this link early in the article when first introducing key data or claims\n"
-        "  - If primary_source.url is null or empty, then DON'T add any external links (better no link than wrong link)\n\n"
-        "CRITICAL EXTERNAL LINKING RULES:\n"
-        "  - NEVER INVENT OR CONSTRUCT URLs - only use URLs that are explicitly provided in the input data\n"
-        "  - If a URL is not provided in the article data, primary source data, or analysis, DO NOT CREATE ONE\n"
-        "  - NEVER guess URL paths, filenames, or IDs - even if they seem logical\n"
-        "    ❌ FORBIDDEN: Constructing 'https://lamoncloa.gob.es/.../160126-afiliacion-extranjeros.aspx' from context\n"
-        "    ✓ CORRECT: Only link to the primary_source.url provided, or don't link at all\n"
-        "  - NEVER include links with placeholder IDs like 'XXXXX' or '/status/XXXXX'\n"
-        "  - NEVER link to generic homepages without a specific page:\n"
-        "    ❌ FORBIDDEN: https://www.icao.int/\n"
-        "    ❌ FORBIDDEN: https://www.example.com/\n"
-        "    ✓ ALLOWED: https://www.icao.int/security/safeguarding/pages/default.aspx (specific page)\n"
-        "  - If you mention an external organization but don't have a specific relevant URL, do NOT add a link\n"
-        "  - Only add external links if ALL of these are true:\n"
-        "    1. The URL was PROVIDED in the input data (not constructed by you)\n"
-        "    2. The URL is complete and specific (not just a domain homepage)\n"
-        "    3. The URL directly supports the specific claim being made\n"
-        "  - When referencing government reports, ministry statements, or official data:\n"
-        "    ✓ CORRECT: \"According to the Ministry of Inclusion, foreign workers now represent 14.1% of contributors.\"\n"
-        "    ❌ WRONG: \"<a href='https://lamoncloa.gob.es/...[invented path]'>According to the Ministry</a>...\"\n"
-        "  - When mentioning organizations for context, do NOT add generic homepage links:\n"
-        "    ✓ CORRECT: \"...as outlined by international aviation security protocols.\"\n"
-        "    ❌ WRONG: \"...from the <a href='https://www.icao.int/'>International Civil Aviation Organization</a>.\"\n"
-        "  - If you cannot find a specific, verified URL in the provided data, it's better to have NO link than an invented link\n\n"
-        "SOCIAL MEDIA LINKS (STRICT RULES):\n"
-        "  - NEVER construct Twitter/X URLs with guessed status IDs\n"
-        "    ❌ FORBIDDEN: https://x.com/salvadorilla/status/1748057288647704739 (if not in input data)\n"
-        "    ❌ FORBIDDEN: https://twitter.com/username/status/[any ID you think might be right]\n"
-        "  - Twitter/X status IDs are unique 18-19 digit numbers - you cannot guess them\n"
-        "  - If the article mentions a tweet/post but doesn't provide the exact URL, do NOT link to it\n"
-        "  - Same applies to Instagram, Facebook, LinkedIn - never construct social media URLs\n"
-        "  - If you want to reference a social media post:\n"
-        "    ✓ CORRECT: \"Illa posted on X announcing the meeting.\" (no link)\n"
-        "    ❌ WRONG: \"Illa <a href='https://x.com/salvadorilla/status/[made-up-id]'>posted on X</a> announcing the meeting.\"\n"
-        "  - ONLY link to social media if the EXACT URL is provided in the input data\n\n"
-        "CRITICAL WRITING RULES (Modern British Journalism):\n\n"
-        "1. OPENING SENTENCE:\n"
-        "   - Start with a strong, concrete fact that states the key impact on people\n"
-        "   - Example: \"One in three people using public transport in Barcelona now travels on a discounted or social ticket.\"\n"
-        "   - NOT: \"Barcelona's transport system has undergone significant changes...\"\n\n"
-        "2. PARAGRAPH STRUCTURE:\n"
-        "   - One idea per paragraph\n"
-        "   - Maximum 2-3 sentences per paragraph\n"
-        "   - Short, punchy, easy to scan on mobile\n\n"
-        "3. ACTIVE VOICE:\n"
-        "   - Put institutions and people at the start of sentences\n"
-        "   - Example: \"The government is using cheaper tickets to reduce car use.\"\n"
-        "   - NOT: \"Fare policy is being used as a lever to reduce car use.\"\n\n"
-        "4. SIMPLE LANGUAGE:\n"
-        "   - Use plain English over abstract academic wording\n"
-        "   - NEVER use: \"structural reconfiguration\", \"institutional message\", \"funding architecture\", \"lever\", \"ambition is to\"\n"
-        "   - Turn concepts into actions: \"The council plans to...\" not \"The ambition is to...\"\n\n"
-        "5. STATISTICS:\n"
-        "   - State the number first, then explain what it means\n"
-        "   - Example: \"33% of all passengers now use discounted fares. That shows subsidised travel is no longer marginal.\"\n\n"
-        "6. SENTENCE LENGTH:\n"
-        "   - If a sentence has more than one comma, split it\n"
-        "   - Aim for natural, spoken rhythm\n"
-        "   - Break up long, complex sentences\n\n"
-        "7. EXPLAIN POLICY SIMPLY:\n"
-        "   - Present funding or subsidies as if explaining to a commuter\n"
-        "   - Example: \"The State pays 20% of the discount. The Generalitat covers the remaining 30%.\"\n\n"
-        "8. SUBHEADINGS (H2/H3):\n"
-        "   - Must answer real questions readers would ask\n"
-        "   - Example: \"Who qualifies for these tickets?\", \"Who pays for the discounts?\", \"What's changing with ticket technology?\"\n"
-        "   - NOT: \"Policy Implementation Framework\" or \"Strategic Overview\"\n\n"
-        "9. TONE:\n"
-        "   - Confident, journalistic, factual\n"
-        "   - NO ceremonial or inflated language\n"
-        "   - NO academic framing\n"
-        "   - NEVER use: \"the objective is\", \"the ambition is\", \"this demonstrates that\"\n"
-        "   - NEVER use: \"marks a significant milestone\", \"in an exciting development\"\n\n"
-        "10. BRITISH ENGLISH SPELLING (MANDATORY):\n"
-        "    - ALWAYS use British spelling, NEVER American:\n"
-        "      ✓ organised, NOT organized\n"
-        "      ✓ recognised, NOT recognized\n"
-        "      ✓ emphasised, NOT emphasized\n"
-        "      ✓ realised, NOT realized\n"
-        "      ✓ specialised, NOT specialized\n"
-        "      ✓ characterised, NOT characterized\n"
-        "      ✓ prioritised, NOT prioritized\n"
-        "      ✓ maximised, NOT maximized\n"
-        "      ✓ minimised, NOT minimized\n"
-        "      ✓ authorised, NOT authorized\n"
-        "      ✓ legalised, NOT legalized\n"
-        "      ✓ finalised, NOT finalized\n"
-        "      ✓ analysed, NOT analyzed\n"
-        "      ✓ capitalised, NOT capitalized\n"
-        "      ✓ standardised, NOT standardized\n"
-        "      ✓ localised, NOT localized\n"
-        "      ✓ colour, NOT color\n"
-        "      ✓ favour, NOT favor\n"
-        "      ✓ labour, NOT labor\n"
-        "      ✓ behaviour, NOT behavior\n"
-        "      ✓ centre, NOT center\n"
-        "      ✓ metre, NOT meter (measurement)\n"
-        "      ✓ defence, NOT defense\n"
-        "      ✓ offence, NOT offense\n"
-        "      ✓ licence, NOT license (noun)\n"
-        "      ✓ travelling, NOT traveling\n"
-        "      ✓ cancelled, NOT canceled\n"
-        "      ✓ modelling, NOT modeling\n"
-        "      ✓ programme, NOT program (except for computer programs)\n"
-        "    - If in doubt, prefer the -ise/-isation form over -ize/-ization\n\n"
-        "11. BANNED PHRASES (NEVER USE THESE):\n"
-        "    ❌ \"have cause for celebration\"\n"
-        "    ❌ \"That debate has been building for months\"\n"
-        "    ❌ \"excited the community\"\n"
-        "    ❌ \"will be closely following\"\n"
-        "    ❌ \"structural reconfiguration\"\n"
-        "    ❌ \"institutional message\"\n"
-        "    ❌ \"funding architecture\"\n"
-        "    ❌ \"lever for change\"\n"
-        "    ❌ \"the ambition is to\"\n"
-        "    ❌ \"the objective is to\"\n"
-        "    ❌ \"this demonstrates that\"\n\n"
-        "12. CLOSING PARAGRAPH / CALL-TO-ACTION RULES:\n"
-        "    - NEVER end with generic \"For more information, visit [organization] website\" linking to a homepage\n"
-        "    - FORBIDDEN closing patterns:\n"
-        "      ❌ \"For more information on Barcelona's cultural venues, visit the Barcelona City Council website.\" (links to https://www.barcelona.cat/)\n"
-        "      ❌ \"Visit the official website for more details.\" (links to homepage)\n"
-        "      ❌ \"More information is available at [organization].\" (links to homepage)\n"
-        "    - ACCEPTABLE closing approaches (in order of preference):\n"
-        "      1. End with a relevant fact, quote, or forward-looking statement about the story\n"
-        "         ✓ \"The new measures will take effect from March 2026.\"\n"
-        "         ✓ \"Officials said further details would be announced in the coming weeks.\"\n"
-        "      2. If you have a SPECIFIC relevant link (not homepage), integrate it naturally:\n"
-        "         ✓ \"Full survey results are available in the <a href='https://example.com/reports/2026/survey.pdf'>official report</a>.\"\n"
-        "         ✓ \"The council has published the <a href='https://example.com/planning/2026/proposal'>detailed proposal</a> online.\"\n"
-        "      3. Provide context without any link:\n"
-        "         ✓ \"The Barcelona City Council maintains information on cultural venues and events.\"\n"
-        "         ✓ \"Further updates will be published on the official website.\"\n"
-        "    - NEVER add a closing paragraph just to include a link\n"
-        "    - The article should feel complete without needing a generic \"visit website\" CTA\n\n"
-        "FINAL CHECK:\n"
-        "  - The article must be easily readable on a phone\n"
-        "  - It must sound like something from The Guardian or BBC News, not a policy report\n"
-        "  - Every sentence should pass the \"would you say this out loud?\" test\n"
-        "  - The closing paragraph must NOT contain a generic homepage link\n\n"
-        "Example format:\n"
-        "<!-- wp:heading {\"level\":1} -->\n"
-        "<h1>Title here</h1>\n"
-        "<!-- /wp:heading -->\n\n"
-        "<!-- wp:paragraph -->\n"
-        "<p>Intro paragraph with keyphrase...</p>\n"
-        "<!-- /wp:paragraph -->\n\n"
-        "<!-- wp:heading {\"level\":2} -->\n"
-        "<h2>Section heading</h2>\n"
-        "<!-- /wp:heading -->\n\n"
-        "<!-- wp:paragraph -->\n"
-        "<p>Body text...</p>\n"
-        "<!-- /wp:paragraph -->\n\n"
-        "Return ONLY valid JSON in this exact structure:\n\n"
-        "{\n"
-        "  \"meta_title\": \"...\",\n"
-        "  \"meta_description\": \"...\",\n"
-        "  \"primary_keyword\": \"...\",\n"
-        "  \"slug\": \"...\",\n"
-        "  \"tags\": [\"...\", \"...\"],\n"
-        "  \"excerpt\": \"...\",\n"
-        "  \"wp_block_content\": \"...\"\n"
-        "}\n\n"
-        "Here is the original article JSON:\n"
-        "<ORIGINAL_ARTICLE_JSON_HERE>\n\n"
-        "Here is the translation & analysis JSON:\n"
-        "<ANALYSIS_JSON_HERE>\n\n"
-        "Here is the primary source JSON:\n"
-        "<PRIMARY_SOURCE_JSON_HERE>"
-    )
-
-    system_message = resolve_prompt(prompt_overrides, "PROMPT_ARTICLE_SYSTEM", system_message)
-    user_message = resolve_prompt(prompt_overrides, "PROMPT_ARTICLE_USER", user_message)
-    user_message = user_message.replace("<ORIGINAL_ARTICLE_JSON_HERE>", original_json)
-    user_message = user_message.replace("<ANALYSIS_JSON_HERE>", analysis_json)
-    user_message = user_message.replace("<PRIMARY_SOURCE_JSON_HERE>", primary_json)
+    fills = {
+        "<ORIGINAL_ARTICLE_JSON_HERE>": _dumps_prompt_json(original_article),
+        "<ANALYSIS_JSON_HERE>": _dumps_prompt_json(analysis),
+        "<PRIMARY_SOURCE_JSON_HERE>": _dumps_prompt_json(primary_source),
+    }
+
+    system_message = resolve_prompt(prompt_overrides, "PROMPT_ARTICLE_SYSTEM", _ARTICLE_SYSTEM_MESSAGE)
+    user_template = resolve_prompt(prompt_overrides, "PROMPT_ARTICLE_USER", _ARTICLE_USER_MESSAGE)
+    parts = list(_split_user_template(user_template))
+    # Odd indices hold the placeholders captured by the split
+    parts[1::2] = [fills[name] for name in parts[1::2]]
 
     if related_articles is not None:
-        related_json = json.dumps(_normalise_unicode(related_articles), ensure_ascii=False, indent=2)
-        user_message += (
-            "\n\nYou will also receive a JSON object describing some existing articles from this site that should be referenced in the new article when appropriate.\n"
-            "For each entry, you will see: url, title, anchor_text, why_relevant, and suggested_insertion.\n\n"
-            "Please:\n"
-            "  - Weave up to 3 references into the article body in a natural way.\n"
-            "  - Use standard HTML anchor tags for each hyperlink, e.g.:\n"
-            "    <a href=\"URL\">anchor_text</a>\n"
-            "  - Place one link in the intro or early body if possible.\n"
-            "  - Do not over-link: at most one link per related article.\n\n"
-            "CRITICAL LINKING REQUIREMENTS:\n"
-            "  - Each related article link MUST be introduced with a UNIQUE phrase or sentence structure.\n"
-            "  - NEVER repeat the same linking pattern or sentence structure.\n"
-            "  - Vary your linking style for each reference:\n"
-            "    * First link: Natural contextual reference (e.g., \"The city previously addressed similar concerns about...\")\n"
-            "    * Second link: Background reference (e.g., \"This follows earlier action on...\")\n"
-            "    * Third link: Continuation reference (e.g., \"The issue connects to broader questions about...\")\n"
-            "  - Use different sentence structures and vocabulary for each link.\n"
-            "  - Avoid formulaic patterns like \"we covered it in...\" or \"as we reported in...\"\n"
-            "  - Make each link introduction flow naturally from the surrounding paragraph's topic.\n"
-            "  - If you cannot introduce a link naturally and uniquely, skip it rather than force it.\n\n"
-            "EXAMPLES OF LINKING VARIETY:\n"
-            "  ❌ BAD (repetitive - DO NOT DO THIS):\n"
-            "    \"That debate has been building for months — we covered it in streamlining municipal bureaucracy.\"\n"
-            "    \"That debate has been building for months — we covered it in scrutiny of public service operations.\"\n\n"
-            "  ✅ GOOD (varied - DO THIS):\n"
-            "    \"The city previously addressed similar concerns when streamlining municipal bureaucracy.\"\n"
-            "    \"This follows earlier scrutiny of public service operations, which raised questions about oversight.\"\n"
-            "    \"Related questions emerged during recent discussions about transparency requirements.\"\n\n"
-            "RELATED ARTICLES JSON:\n"
-            f"{related_json}"
-        )
+        parts.append(_RELATED_ARTICLES_INSTRUCTIONS)
+        parts.append(_dumps_prompt_json(related_articles))
+    user_message = "".join(parts)
 
     return {"system_message": system_message, "user_message": user_message}
 
 
+@lru_cache(maxsize=4096)
+def _normalise_str(value: str) -> str:
+    # The same strings are normalised repeatedly (main.py re-normalises the
+    # analysis and article payloads before printing/saving them)
+    return unicodedata.normalize("NFC", value)
+
+
 def _normalise_unicode(value):
+    """Return a copy of a JSON-like value with every string NFC-normalised.
+
+    Walks containers with an explicit stack, so deeply nested payloads cannot
+    hit the recursion limit. Inputs are never modified.
+    """
     if isinstance(value, str):
-        return unicodedata.normalize("NFC", value)
-    if isinstance(value, list):
-        return [_normalise_unicode(item) for item in value]
-    if isinstance(value, dict):
-        return {key: _normalise_unicode(val) for key, val in value.items()}
-    return value
+        return _normalise_str(value)
+    if not isinstance(value, (list, dict)):
+        return value
+    root = [] if isinstance(value, list) else {}
+    stack = [(value, root)]
+    while stack:
+        source, target = stack.pop()
+        is_list = isinstance(target, list)
+        for key, item in enumerate(source) if is_list else source.items():
+            if isinstance(item, str):
+                item = _normalise_str(item)
+            elif isinstance(item, (list, dict)):
+                child = [] if isinstance(item, list) else {}
+                stack.append((item, child))
+                item = child
+            if is_list:
+                target.append(item)
+            else:
+                target[key] = item
+    return root
+
+
+_H1_TAG_RE = re.compile(r"<(/?)h1>", re.IGNORECASE)
 
 
 def _ensure_single_h1_block(content: str, title: str | None) -> str:
@@ -414,35 +526,50 @@ def _ensure_single_h1_block(content: str, title: str | None) -> str:
 
     if h1_block not in content and h1_tag not in content:
         safe_title = title or ""
-        h1_html = (
-            f"{h1_block}\n<h1>{safe_title}</h1>\n<!-- /wp:heading -->\n\n"
-        )
-        return h1_html + content
+        return "".join((h1_block, "\n<h1>", safe_title, "</h1>\n<!-- /wp:heading -->\n\n", content))
 
     # Convert any additional H1 blocks after the first to H2 blocks
     parts = content.split(h1_block)
     if len(parts) > 2:
-        rebuilt = [parts[0], h1_block + parts[1]]
+        rebuilt = [parts[0], h1_block, parts[1]]
         for fragment in parts[2:]:
             fragment = fragment.replace(h1_tag, "<h2>").replace(h1_close, "</h2>")
             fragment = fragment.replace("\"level\":1", "\"level\":2")
-            rebuilt.append("<!-- wp:heading {\"level\":2} -->" + fragment)
+            rebuilt.append("<!-- wp:heading {\"level\":2} -->")
+            rebuilt.append(fragment)
         content = "".join(rebuilt)
 
-    # If multiple <h1> tags exist, downgrade extras
-    def _downgrade(match):
-        return "<h2>"
-
-    h1_matches = list(re.finditer(r"<h1>", content, flags=re.IGNORECASE))
-    if len(h1_matches) > 1:
-        first = h1_matches[0].start()
-        content = content[: first + 4] + content[first + 4 :]
-        content = re.sub(r"<h1>", _downgrade, content, flags=re.IGNORECASE, count=len(h1_matches) - 1)
-        content = re.sub(r"</h1>", "</h2>", content, flags=re.IGNORECASE)
+    # If multiple <h1> tags exist, keep the first pair and downgrade the rest
+    tags = list(_H1_TAG_RE.finditer(content))
+    if sum(1 for tag in tags if not tag.group(1)) > 1:
+        pieces = []
+        last = 0
+        seen_open = seen_close = False
+        for tag in tags:
+            if tag.group(1):
+                # Only the close that follows the kept <h1> pairs with it
+                keep = seen_open and not seen_close
+                seen_close = seen_close or keep
+            else:
+                keep, seen_open = not seen_open, True
+            if keep:
+                continue
+            pieces.append(content[last : tag.start()])
+            pieces.append("</h2>" if tag.group(1) else "<h2>")
+            last = tag.end()
+        pieces.append(content[last:])
+        content = "".join(pieces)
 
     return content
 
 
+_PARAGRAPH_BLOCK = (
+    "<!-- wp:paragraph -->\n"
+    "<p>{text}</p>\n"
+    "<!-- /wp:paragraph -->\n\n"
+)
+
+
 def _ensure_intro_paragraphs(content: str, primary_keyword: str | None, excerpt: str | None) -> str:
     if not content:
         return content
@@ -451,8 +578,7 @@ def _ensure_intro_paragraphs(content: str, primary_keyword: str | None, excerpt:
     if idx == -1:
         return content
 
-    before = content[:idx]
-    paragraph_count = before.count("<!-- wp:paragraph -->")
+    paragraph_count = content.count("<!-- wp:paragraph -->", 0, idx)
     if paragraph_count >= 2:
         return content
 
@@ -464,24 +590,19 @@ def _ensure_intro_paragraphs(content: str, primary_keyword: str | None, excerpt:
     else:
         intro_two = "This update adds fresh context to the story, as the market adjusts to new pressures."
 
-    paragraph_block = (
-        "<!-- wp:paragraph -->\n"
-        "<p>{text}</p>\n"
-        "<!-- /wp:paragraph -->\n\n"
-    )
-
-    insert = "".join(
-        [
-            paragraph_block.format(text=intro_one),
-            paragraph_block.format(text=intro_two),
-        ]
+    # Assembled in one join rather than chained concatenation of the whole body
+    return "".join(
+        (
+            content[:idx],
+            _PARAGRAPH_BLOCK.format(text=intro_one),
+            _PARAGRAPH_BLOCK.format(text=intro_two),
+            content[idx:],
+        )
     )
 
-    return before + insert + content[idx:]
-
 
-def _estimate_tokens(text: str) -> int:
-    return max(1, len(text) // 4)
+def _estimate_tokens(*texts: str) -> int:
+    return max(1, sum(map(len, texts)) // 4)
 
 
 def _validate_article_payload(payload: dict) -> dict:
@@ -537,22 +658,17 @@ def generate_wp_article(
             content = payload.get("wp_block_content", "")
             content = _ensure_single_h1_block(content, payload.get("meta_title"))
             content = _ensure_intro_paragraphs(content, payload.get("primary_keyword"), payload.get("excerpt"))
-            # Convert any American spellings to British English
-            content = convert_to_british_english(content)
             payload["wp_block_content"] = content
-            # Also convert meta fields
-            if payload.get("meta_title"):
-                payload["meta_title"] = convert_to_british_english(payload["meta_title"])
-            if payload.get("meta_description"):
-                payload["meta_description"] = convert_to_british_english(payload["meta_description"])
-            if payload.get("excerpt"):
-                payload["excerpt"] = convert_to_british_english(payload["excerpt"])
+            # Convert any American spellings to British English, body and meta fields alike
+            _convert_fields_to_british(
+                payload, ("wp_block_content", "meta_title", "meta_description", "excerpt")
+            )
             return {
                 **payload,
                 "llm_debug_context": {
                     "used_model": model_name,
                     "prompt_tokens_estimate": _estimate_tokens(
-                        prompt["system_message"] + prompt["user_message"]
+                        prompt["system_message"], prompt["user_message"]
                     ),
                 },
             }
@@ -1,5 +1,9 @@
 import random
 import re
+from functools import lru_cache
+
+_MULTI_NL_RE = re.compile(r"\n{3,}")
+_WP_BLOCK_NAME_RE = re.compile(r"wp:([a-z0-9/_-]+)", re.IGNORECASE)
 
 FOOTER_CTA_BLOCKS_BARCELONA = [
     """<!-- wp:html -->
@@ -142,6 +146,24 @@ def primary_source_is_reliable(primary_source: dict | None, threshold: float) ->
         return False
 
 
+@lru_cache(maxsize=128)
+def _credit_block_pattern(source_url: str, label: str) -> re.Pattern:
+    """Compiled pattern for a ``label`` credit link paragraph pointing at ``source_url``.
+
+    Matches the paragraph either wrapped in a Gutenberg paragraph block or as
+    a bare <p>; the wrapped form is tried first so its comments go with it.
+    """
+    link = (
+        r"<p>\s*<a[^>]*href=[\"']"
+        + re.escape(source_url)
+        + r"[\"'][^>]*>\s*"
+        + re.escape(label)
+        + r"\s*</a>\s*</p>"
+    )
+    gutenberg = r"<!--\s*wp:paragraph\s*-->\s*" + link + r"\s*<!--\s*/wp:paragraph\s*-->"
+    return re.compile(gutenberg + "|" + link, re.IGNORECASE | re.DOTALL)
+
+
 def finalise_source_credits(
     content: str,
     source_url: str | None,
@@ -171,33 +193,11 @@ def finalise_source_credits(
     if not source_url:
         return content
 
-    def _remove_block(content_text: str, label: str) -> str:
-        url = re.escape(source_url)
-        label_pattern = re.escape(label)
-        gutenberg = (
-            r"<!--\s*wp:paragraph\s*-->\s*"
-            r"<p>\s*<a[^>]*href=[\"']"
-            + url
-            + r"[\"'][^>]*>\s*"
-            + label_pattern
-            + r"\s*</a>\s*</p>\s*"
-            r"<!--\s*/wp:paragraph\s*-->"
-        )
-        raw = (
-            r"<p>\s*<a[^>]*href=[\"']"
-            + url
-            + r"[\"'][^>]*>\s*"
-            + label_pattern
-            + r"\s*</a>\s*</p>"
-        )
-        content_text = re.sub(gutenberg, "", content_text, flags=re.IGNORECASE | re.DOTALL)
-        content_text = re.sub(raw, "", content_text, flags=re.IGNORECASE | re.DOTALL)
-        return content_text
-
-    # Remove any existing source credits
-    content = _remove_block(content, "Source")
-    content = _remove_block(content, "Link to original article")
-    content = re.sub(r"\n{3,}", "\n\n", content).rstrip()
+    # Remove any existing source credits, one pass per label: dropping a "Source" paragraph can leave its block
+    # wrapping only a "Link to original article" one, which the second removes
+    content = _credit_block_pattern(source_url, "Source").sub("", content)
+    content = _credit_block_pattern(source_url, "Link to original article").sub("", content)
+    content = _MULTI_NL_RE.sub("\n\n", content).rstrip()
 
     # Check if we have a reliable primary source
     has_reliable_primary = primary_source_is_reliable(primary_source, confidence_threshold)
@@ -235,6 +235,18 @@ a.bnn-amazon-deals:hover video {
 """
 
 
+# Short, unique piece of PROMO_BLOCK used to rule it out cheaply
+_PROMO_MARKER = 'class="bnn-amazon-deals"'
+
+
+def _promo_block_end(content: str) -> int:
+    """Index just past the promo block, or -1 if the article has none."""
+    if _PROMO_MARKER not in content:
+        return -1
+    idx = content.find(PROMO_BLOCK)
+    return -1 if idx == -1 else idx + len(PROMO_BLOCK)
+
+
 def _spacer_block(height_px: int) -> str:
     return (
         f"<!-- wp:spacer {{\"height\":\"{height_px}px\"}} -->\n"
@@ -250,8 +262,8 @@ def _last_block_name(content: str) -> str | None:
     end = content.find("-->", idx)
     if end == -1:
         return None
-    snippet = content[idx:end]
-    match = re.search(r"wp:([a-z0-9/_-]+)", snippet, re.IGNORECASE)
+    # Bounded search over the comment itself, without slicing it out
+    match = _WP_BLOCK_NAME_RE.search(content, idx, end)
     if not match:
         return None
     return match.group(1).lower()
@@ -266,8 +278,8 @@ def ensure_spacer_before_image(content: str, insert_at: int, height_px: int = 24
     last_block = _last_block_name(before)
     if last_block in {"html", "pattern", "image", "block"} or "bnn-amazon-deals" in before[-800:]:
         spacer = _spacer_block(height_px)
-        content = content[:insert_at] + "\n\n" + spacer + "\n\n" + content[insert_at:]
-        insert_at += len("\n\n" + spacer + "\n\n")
+        content = "".join((content[:insert_at], "\n\n", spacer, "\n\n", content[insert_at:]))
+        insert_at += len(spacer) + 4
     return content, insert_at
 
 
@@ -302,13 +314,13 @@ def add_breadcrumb_block(content: str) -> str:
         return YOAST_BREADCRUMB_BLOCK
     if YOAST_BREADCRUMB_BLOCK in content:
         return content
-    if PROMO_BLOCK in content:
-        idx = content.find(PROMO_BLOCK) + len(PROMO_BLOCK)
-        return content[:idx] + "\n" + YOAST_BREADCRUMB_BLOCK + content[idx:]
+    idx = _promo_block_end(content)
+    if idx != -1:
+        return "".join((content[:idx], "\n", YOAST_BREADCRUMB_BLOCK, content[idx:]))
     end_second_para = _find_nth_paragraph_end(content, 2)
     if end_second_para is None:
         return YOAST_BREADCRUMB_BLOCK + content
-    return content[:end_second_para] + "\n\n" + YOAST_BREADCRUMB_BLOCK + content[end_second_para:]
+    return "".join((content[:end_second_para], "\n\n", YOAST_BREADCRUMB_BLOCK, content[end_second_para:]))
 
 
 def add_promo_block(content: str, platform: str = "wordpress") -> str:
@@ -329,13 +341,13 @@ def add_promo_block(content: str, platform: str = "wordpress") -> str:
     if platform and platform.lower() == "ghost":
         return content
 
-    if PROMO_BLOCK in content:
+    if _promo_block_end(content) != -1:
         return content
 
     end_second_para = _find_nth_paragraph_end(content, 2)
     if end_second_para is None:
         return PROMO_BLOCK + content
-    return content[:end_second_para] + "\n\n" + PROMO_BLOCK + "\n" + content[end_second_para:]
+    return "".join((content[:end_second_para], "\n\n", PROMO_BLOCK, "\n", content[end_second_para:]))
 
 
 def add_inline_image_block(content: str, image_url: str, alt_text: str, spacer_height: int = 24) -> str:
@@ -347,16 +359,16 @@ def add_inline_image_block(content: str, image_url: str, alt_text: str, spacer_h
         f"alt=\"{alt_text}\" /></figure>\n"
         "<!-- /wp:image -->\n\n"
     )
-    if PROMO_BLOCK in content:
-        idx = content.find(PROMO_BLOCK) + len(PROMO_BLOCK)
+    idx = _promo_block_end(content)
+    if idx != -1:
         content, idx = ensure_spacer_before_image(content, idx, height_px=spacer_height)
-        return content[:idx] + "\n" + image_block + content[idx:]
+        return "".join((content[:idx], "\n", image_block, content[idx:]))
     end_second_para = _find_nth_paragraph_end(content, 2)
     if end_second_para is None:
         content, insert_at = ensure_spacer_before_image(content, 0, height_px=spacer_height)
         return image_block + content
     content, end_second_para = ensure_spacer_before_image(content, end_second_para, height_px=spacer_height)
-    return content[:end_second_para] + "\n\n" + image_block + content[end_second_para:]
+    return "".join((content[:end_second_para], "\n\n", image_block, content[end_second_para:]))
 
 
 def strip_lede_title(content: str, headline: str) -> str:
@@ -369,14 +381,23 @@ def strip_lede_title(content: str, headline: str) -> str:
     if para_end == -1:
         return content
     block = content[para_start:para_end]
-    if not block.lower().lstrip().startswith("<p>" + headline.lower()):
+    target = "<p>" + headline.lower()
+    if headline.isascii():
+        # Lowercase only the prefix under test rather than the whole block;
+        # exact for an ASCII target since no character lowers to fewer chars
+        j = 0
+        while j < len(block) and block[j].isspace():
+            j += 1
+        if not block[j:j + len(target)].lower().startswith(target):
+            return content
+    elif not block.lower().lstrip().startswith(target):
         return content
     stripped = block.replace(headline, "", 1).lstrip()
     # clean up leading punctuation/space after removal
     stripped = stripped.replace("<p> ", "<p>", 1)
     stripped = stripped.replace("<p>. ", "<p>", 1)
     stripped = stripped.replace("<p>, ", "<p>", 1)
-    return content[:para_start] + stripped + content[para_end:]
+    return "".join((content[:para_start], stripped, content[para_end:]))
 
 
 def ensure_complimentary_lede(content: str, headline: str) -> str:
@@ -428,21 +449,24 @@ def move_first_h2_after_intro(content: str) -> str:
     insert_pos = _find_nth_paragraph_end(content, 2)
     if insert_pos is None:
         return content
-    if PROMO_BLOCK in content:
-        insert_pos = content.find(PROMO_BLOCK) + len(PROMO_BLOCK)
-    if YOAST_BREADCRUMB_BLOCK in content:
-        breadcrumb_end = content.find(YOAST_BREADCRUMB_BLOCK) + len(YOAST_BREADCRUMB_BLOCK)
+    promo_end = _promo_block_end(content)
+    if promo_end != -1:
+        insert_pos = promo_end
+    breadcrumb_start = content.find(YOAST_BREADCRUMB_BLOCK)
+    if breadcrumb_start != -1:
+        breadcrumb_end = breadcrumb_start + len(YOAST_BREADCRUMB_BLOCK)
         if breadcrumb_end > insert_pos:
             insert_pos = breadcrumb_end
 
     if start >= insert_pos:
         return content
 
-    h2_block_text = content[start:end]
-    before = content[:start]
-    after = content[end:]
-    content = before + after
-    return content[:insert_pos] + "\n\n" + h2_block_text + content[insert_pos:]
+    # Cut the heading out and re-insert it at insert_pos of the shortened text,
+    # slicing the original once rather than building the shortened copy
+    split_at = end + insert_pos - start
+    return "".join(
+        (content[:start], content[end:split_at], "\n\n", content[start:end], content[split_at:])
+    )
 
 
 def enforce_intro_structure(content: str, headline: str, platform: str = "wordpress") -> str:
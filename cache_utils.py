@@ -1,34 +1,110 @@
 import hashlib
 import json
+import sqlite3
+import threading
 from pathlib import Path
 
+from config import dumps_json, loads_json
+
+CACHE_DB_PATH = Path(__file__).resolve().parent / "run_cache.sqlite"
+# Legacy single-file cache, imported into the database on first use
 CACHE_PATH = Path(__file__).resolve().parent / "run_cache.json"
 
+# One connection per process, shared across threads; the lock serialises use
+_CONN_LOCK = threading.Lock()
+_conn: sqlite3.Connection | None = None
+_conn_path: Path | None = None
+
+
+def _init_db(conn: sqlite3.Connection) -> None:
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cache (
+            hash TEXT PRIMARY KEY,
+            payload TEXT NOT NULL
+        )
+        """
+    )
+    _migrate_json_cache(conn)
+
+
+def _migrate_json_cache(conn: sqlite3.Connection) -> None:
+    """Copy entries from run_cache.json once per database; the file is left in place."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= 1:
+        return
+    legacy = None
+    if CACHE_PATH.exists():
+        try:
+            legacy = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            legacy = None
+    with conn:
+        if isinstance(legacy, dict):
+            conn.executemany(
+                "INSERT OR IGNORE INTO cache (hash, payload) VALUES (?, ?)",
+                [(key, _dumps_payload(value)) for key, value in legacy.items()],
+            )
+        conn.execute("PRAGMA user_version = 1")
 
-def _load_cache() -> dict:
-    if not CACHE_PATH.exists():
-        return {}
+
+def _get_conn() -> sqlite3.Connection:
+    """Return the shared connection; callers must hold _CONN_LOCK."""
+    global _conn, _conn_path
+    if _conn is not None and _conn_path == CACHE_DB_PATH:
+        return _conn
+    if _conn is not None:
+        _conn.close()
+        _conn = None
+    conn = sqlite3.connect(CACHE_DB_PATH, check_same_thread=False)
     try:
-        return json.loads(CACHE_PATH.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        return {}
+        _init_db(conn)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    _conn, _conn_path = conn, CACHE_DB_PATH
+    return conn
+
+
+def _dumps_payload(payload) -> str:
+    return dumps_json(payload).decode("utf-8")
 
 
-def _save_cache(cache: dict) -> None:
-    CACHE_PATH.write_text(json.dumps(cache, indent=2, ensure_ascii=False), encoding="utf-8")
+def _loads_payload(raw: str):
+    return loads_json(raw.encode("utf-8"))
 
 
 def compute_file_hash(path: str) -> str:
-    data = Path(path).read_bytes()
-    return hashlib.sha256(data).hexdigest()
+    # Streamed through a fixed buffer rather than read into memory whole
+    with open(path, "rb") as handle:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(handle, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
 
 
 def get_cached_result(file_hash: str) -> dict | None:
-    cache = _load_cache()
-    return cache.get(file_hash)
+    try:
+        with _CONN_LOCK:
+            row = _get_conn().execute("SELECT payload FROM cache WHERE hash = ?", (file_hash,)).fetchone()
+    except sqlite3.OperationalError:
+        # e.g. a read-only filesystem (Cloud Run): run without the cache
+        return None
+    if row is None:
+        return None
+    return _loads_payload(row[0])
 
 
 def set_cached_result(file_hash: str, payload: dict) -> None:
-    cache = _load_cache()
-    cache[file_hash] = payload
-    _save_cache(cache)
+    # One row per article, so an insert no longer rewrites the whole cache
+    raw = _dumps_payload(payload)
+    try:
+        with _CONN_LOCK:
+            conn = _get_conn()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO cache (hash, payload) VALUES (?, ?)", (file_hash, raw))
+    except sqlite3.OperationalError:
+        pass
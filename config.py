@@ -1,20 +1,104 @@
+import copy
 import json
+import math
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 CONFIG_FILE = Path(__file__).resolve().parent / "config.json"
 
+# orjson parses integers outside the 64-bit range as floats; 19+ digit runs are
+# rare enough that sending those documents through the stdlib parser costs nothing
+_WIDE_INT_RE = re.compile(rb"-?\d{19,}")
+
+
+def loads_json(raw: bytes):
+    """Parse JSON bytes with orjson when available, keeping wide integers exact.
+
+    Anything orjson rejects (NaN, Infinity, out-of-range floats) is retried with
+    json.loads, so the accepted input set and error messages stay the stdlib's.
+    """
+    if orjson is not None and _WIDE_INT_RE.search(raw) is None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def _has_non_finite(value) -> bool:
+    """True if a float inside ``value`` (dict values, list/tuple items) is NaN or infinite."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def dumps_json(value, *, indent: bool = False) -> bytes:
+    """Serialise ``value`` as UTF-8 JSON bytes (non-ASCII kept as-is), via orjson when available.
+
+    orjson writes NaN and Infinity as null, and rejects integers beyond 64
+    bits; values holding either go through json.dumps, which keeps them.
+    """
+    if orjson is not None and not _has_non_finite(value):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(value, option=option)
+        except TypeError:
+            pass
+    return json.dumps(value, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+# Bumped by save_config, so a same-size rewrite within one mtime tick (coarse
+# filesystem timestamps) still changes config_version()
+_save_count = 0
+
+
+def config_version() -> tuple[int, int, int] | None:
+    """Return config.json's (mtime_ns, size, save count), or None if it cannot be read.
+
+    Callers that derive data from the config key their caches on this, so an
+    edit to the file, or any save_config call, invalidates them.
+    """
+    try:
+        stat = CONFIG_FILE.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, _save_count
+
+
+@lru_cache(maxsize=1)
+def _load_cached(mtime_ns: int, size: int, save_count: int) -> dict:
+    """Parse config.json; keyed on config_version() so edits invalidate it."""
+    try:
+        return loads_json(CONFIG_FILE.read_bytes())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
 
 def load_config() -> dict:
     """Load config from config.json or environment variables (for cloud deployment)"""
     config = {}
     
-    # Try loading from file first
-    if CONFIG_FILE.exists():
-        try:
-            config = json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            config = {}
+    # Try loading from file first (parsed once per file version)
+    version = config_version()
+    if version is not None:
+        config = copy.deepcopy(_load_cached(*version))
     
     # Fallback to environment variables (for Google Cloud Run)
     env_keys = [
@@ -46,11 +130,17 @@ def load_config() -> dict:
 
 def save_config(config: dict) -> None:
     """Save config to file. Fails gracefully if filesystem is read-only (e.g., Cloud Run)."""
+    global _save_count
     try:
+        # The stdlib encoder, unlike orjson, keeps NaN and Infinity instead of
+        # writing null; the file is small and rarely saved, so speed is moot
         CONFIG_FILE.write_text(json.dumps(config, indent=2, ensure_ascii=False), encoding="utf-8")
     except (OSError, PermissionError) as e:
         # Cloud Run has read-only filesystem - config is in env vars anyway
         pass
+    finally:
+        _save_count += 1
+        _load_cached.cache_clear()
 
 
 def prompt_for_keys(existing: dict) -> dict:
@@ -1,4 +1,11 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared session so consecutive calls reuse the pooled TLS connection
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=2, backoff_factor=0.3))
+_SESSION.mount("https://", _ADAPTER)
 
 
 class DeepSeekError(Exception):
@@ -19,7 +26,7 @@ def call_deepseek_chat(model: str, system_prompt: str, user_prompt: str, api_key
         ],
         "temperature": 0.2,
     }
-    response = requests.post(url, headers=headers, json=payload, timeout=90)
+    response = _SESSION.post(url, headers=headers, json=payload, timeout=90)
     if response.status_code != 200:
         raise DeepSeekError(f"DeepSeek API error: {response.status_code} {response.text}")
     data = response.json()
@@ -1,12 +1,40 @@
+import copy
 import json
 import re
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
 
-
-@dataclass
+from config import loads_json
+
+
+_IMG_SRC_RE = re.compile(r'<img[^>]+src=["\']([^"\']+)["\']', re.IGNORECASE)
+_SCRIPT_RE = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+_STYLE_RE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+_CLOSE_P_RE = re.compile(r'</p>', re.IGNORECASE)
+# <br>, </div> and </li> all become a single newline
+_LINE_BREAK_RE = re.compile(r'<br\s*/?>|</div>|</li>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_MULTI_NL_RE = re.compile(r'\n\s*\n\s*\n+')
+_MULTI_SP_RE = re.compile(r'  +')
+
+# Decoded in this order, so "&amp;lt;" still ends up as "<"
+_HTML_ENTITIES = (
+    ('&nbsp;', ' '),
+    ('&amp;', '&'),
+    ('&lt;', '<'),
+    ('&gt;', '>'),
+    ('&quot;', '"'),
+    ('&#8217;', "'"),
+    ('&#8220;', '"'),
+    ('&#8221;', '"'),
+)
+
+
+@dataclass(slots=True)
 class Article:
     title: Optional[str] = None
     original_title: Optional[str] = None
@@ -23,7 +51,23 @@ class Article:
     primary_source_url: Optional[str] = None  # Primary source URL if provided in metadata
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Same result as dataclasses.asdict, without its per-value reflection;
+        # only external_references holds mutable values needing a deep copy
+        return {
+            "title": self.title,
+            "original_title": self.original_title,
+            "original_language": self.original_language,
+            "main_content_body": self.main_content_body,
+            "date_time": self.date_time,
+            "source_url": self.source_url,
+            "source_name": self.source_name,
+            "source_url_base": self.source_url_base,
+            "image_urls": list(self.image_urls),
+            "keywords": list(self.keywords),
+            "external_references": copy.deepcopy(self.external_references),
+            "profile_name": self.profile_name,
+            "primary_source_url": self.primary_source_url,
+        }
 
 
 SUPPORTED_SUFFIXES = {".json", ".md", ".markdown"}
@@ -42,8 +86,9 @@ def load_article(path: str) -> Article:
 
 
 def _load_from_json(path: Path) -> Article:
+    data = path.read_bytes()
     try:
-        raw = json.loads(path.read_text(encoding="utf-8"))
+        raw = loads_json(data)
     except json.JSONDecodeError as exc:
         raise ValueError(f"Invalid JSON: {exc}")
 
@@ -95,7 +140,7 @@ def _load_from_markdown(path: Path) -> Article:
     # Extract source_url_base from source_url if not provided
     source_url_base = meta.get("source_url_base")
     if not source_url_base and source_url:
-        parsed = urlparse(source_url)
+        parsed = _parse_url(source_url)
         source_url_base = f"{parsed.scheme}://{parsed.netloc}"
 
     # Extract original_title if not provided (use title from metadata)
@@ -133,6 +178,9 @@ def _load_from_markdown(path: Path) -> Article:
 
 
 def _parse_front_matter(text: str) -> tuple[dict, str]:
+    # Most bodies have no front matter; skip splitting them into lines
+    if not text.lstrip().startswith("---"):
+        return {}, text
     lines = text.splitlines()
     if len(lines) >= 3 and lines[0].strip() == "---":
         for idx in range(1, len(lines)):
@@ -157,23 +205,23 @@ def _normalize_keywords(value) -> list[str]:
     if not value:
         return []
     if isinstance(value, list):
-        return [str(item).strip() for item in value if str(item).strip()]
+        # Each item is converted and stripped once, then empties dropped
+        return [item for item in (str(item).strip() for item in value) if item]
     text = str(value).strip()
     if text.startswith("[") and text.endswith("]"):
         inner = text[1:-1].strip()
         if not inner:
             return []
-        return [item.strip().strip('"\'') for item in inner.split(",") if item.strip()]
+        return [item.strip('"\'') for item in (item.strip() for item in inner.split(",")) if item]
     if "," in text:
-        return [item.strip() for item in text.split(",") if item.strip()]
+        return [item for item in (item.strip() for item in text.split(",")) if item]
     return [text]
 
 
 def _extract_image_urls_from_html(html: str) -> list[str]:
     """Extract image URLs from HTML content."""
     # Find all <img> tags and extract src attributes
-    img_pattern = r'<img[^>]+src=["\']([^"\']+)["\']'
-    urls = re.findall(img_pattern, html, re.IGNORECASE)
+    urls = _IMG_SRC_RE.findall(html)
     # Deduplicate and filter out data URIs
     seen = set()
     result = []
@@ -187,43 +235,46 @@ def _extract_image_urls_from_html(html: str) -> list[str]:
 
 def _strip_html_tags(html: str) -> str:
     """Remove HTML tags and decode entities for plain text content."""
-    # Remove script and style elements
-    html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
+    # Plain markdown bodies have no tags, comments or block ends to strip
+    if '<' in html:
+        # Remove script and style elements
+        html = _SCRIPT_RE.sub('', html)
+        html = _STYLE_RE.sub('', html)
 
-    # Remove HTML comments
-    html = re.sub(r'<!--.*?-->', '', html, flags=re.DOTALL)
+        # Remove HTML comments
+        html = _COMMENT_RE.sub('', html)
 
-    # Replace <br>, </p>, </div>, </li> with newlines to preserve some structure
-    html = re.sub(r'<br\s*/?>', '\n', html, flags=re.IGNORECASE)
-    html = re.sub(r'</p>', '\n\n', html, flags=re.IGNORECASE)
-    html = re.sub(r'</div>', '\n', html, flags=re.IGNORECASE)
-    html = re.sub(r'</li>', '\n', html, flags=re.IGNORECASE)
+        # Replace <br>, </p>, </div>, </li> with newlines to preserve some structure
+        html = _LINE_BREAK_RE.sub('\n', html)
+        if '</P>' in html:
+            html = _CLOSE_P_RE.sub('\n\n', html)
+        else:
+            html = html.replace('</p>', '\n\n')
 
-    # Remove all remaining HTML tags
-    html = re.sub(r'<[^>]+>', '', html)
+        # Remove all remaining HTML tags
+        html = _TAG_RE.sub('', html)
 
     # Decode common HTML entities
-    html = html.replace('&nbsp;', ' ')
-    html = html.replace('&amp;', '&')
-    html = html.replace('&lt;', '<')
-    html = html.replace('&gt;', '>')
-    html = html.replace('&quot;', '"')
-    html = html.replace('&#8217;', "'")
-    html = html.replace('&#8220;', '"')
-    html = html.replace('&#8221;', '"')
+    if '&' in html:
+        for entity, char in _HTML_ENTITIES:
+            html = html.replace(entity, char)
 
     # Clean up excessive whitespace
-    html = re.sub(r'\n\s*\n\s*\n+', '\n\n', html)  # Multiple newlines to double newline
-    html = re.sub(r' +', ' ', html)  # Multiple spaces to single space
+    html = _MULTI_NL_RE.sub('\n\n', html)  # Multiple newlines to double newline
+    html = _MULTI_SP_RE.sub(' ', html)  # Runs of spaces to a single space
 
     return html.strip()
 
 
+# Articles in a batch mostly share a handful of sources, and the primary
+# source often repeats source_url, so parse each distinct URL once
+_parse_url = lru_cache(maxsize=256)(urlparse)
+
+
 def _is_valid_url(url: str) -> bool:
     """Check if a URL is well-formed."""
     try:
-        parsed = urlparse(url)
+        parsed = _parse_url(url)
         return bool(parsed.scheme in ('http', 'https') and parsed.netloc)
     except Exception:
         return False
@@ -1,4 +1,5 @@
 import json
+import os
 from pathlib import Path
 
 from agent0_scanner import detect_duplicates
@@ -82,6 +83,70 @@ def test_md_translation_updates_only_h1(tmp_path: Path, monkeypatch) -> None:
     assert meta["agent0_headline_source_field"] == "md_h1"
 
 
+def test_llm_language_detection_and_translation_share_one_call(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "01-article.md"
+    path.write_text("# Titular ambiguo\n\nBody stays.\n", encoding="utf-8")
+    calls = []
+
+    def fake_call(*args, **_kwargs):
+        calls.append(args)
+        return '{"language": "es", "confidence": 0.9, "translation": "Ambiguous headline"}'
+
+    monkeypatch.setattr("agent0_translator._detect_language_local", lambda *_args: None)
+    monkeypatch.setattr("agent0_translator.call_deepseek_chat", fake_call)
+    result = translate_headline_md(path, api_key="test-key", dry_run=True)
+
+    assert len(calls) == 1
+    assert result.headline_en_gb == "Ambiguous headline"
+    assert result.language == "es"
+    assert result.translated is True
+
+
+def test_llm_detection_falls_back_to_separate_calls_on_plain_reply(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "01-article.md"
+    path.write_text("# Titular ambiguo\n\nBody stays.\n", encoding="utf-8")
+    replies = iter([
+        "Ambiguous headline",
+        '{"language": "es", "confidence": 0.9}',
+        "Ambiguous headline",
+    ])
+
+    def fake_call(*_args, **_kwargs):
+        return next(replies)
+
+    monkeypatch.setattr("agent0_translator._detect_language_local", lambda *_args: None)
+    monkeypatch.setattr("agent0_translator.call_deepseek_chat", fake_call)
+    result = translate_headline_md(path, api_key="test-key", dry_run=True)
+
+    assert result.headline_en_gb == "Ambiguous headline"
+    assert result.language == "es"
+    assert result.translated is True
+
+
+def test_llm_detection_keeps_configured_headline_prompt(tmp_path: Path, monkeypatch) -> None:
+    config_path = tmp_path / "config.json"
+    config_path.write_text(
+        json.dumps({"PROMPT_HEADLINE_USER": "House style, please: <HEADLINE>"}), encoding="utf-8"
+    )
+    monkeypatch.setattr("config.CONFIG_FILE", config_path)
+    path = tmp_path / "01-article.md"
+    path.write_text("# Titular ambiguo\n\nBody stays.\n", encoding="utf-8")
+    replies = iter(['{"language": "es", "confidence": 0.9}', "Ambiguous headline"])
+    user_prompts = []
+
+    def fake_call(_model, _system, user_prompt, _key):
+        user_prompts.append(user_prompt)
+        return next(replies)
+
+    monkeypatch.setattr("agent0_translator._detect_language_local", lambda *_args: None)
+    monkeypatch.setattr("agent0_translator.call_deepseek_chat", fake_call)
+    result = translate_headline_md(path, api_key="test-key", dry_run=True)
+
+    assert user_prompts[-1] == "House style, please: Titular ambiguo"
+    assert result.headline_en_gb == "Ambiguous headline"
+    assert result.translated is True
+
+
 def test_processed_move_preserves_relative_structure(tmp_path: Path) -> None:
     input_dir = tmp_path / "input"
     processed_dir = tmp_path / "processed"
@@ -185,3 +250,49 @@ def test_translation_sets_headline_en_gb_even_when_no_translation_needed(tmp_pat
     updated = json.loads(path.read_text(encoding="utf-8"))
     assert result.headline_en_gb == "English headline"
     assert updated["headline_en_gb"] == "English headline"
+
+
+def test_duplicate_detection_reuses_processed_index(tmp_path: Path) -> None:
+    processed_dir = tmp_path / "processed"
+    archive = processed_dir / "2024"
+    archive.mkdir(parents=True)
+    (archive / "01-Old.json").write_text("{}", encoding="utf-8")
+    os.utime(archive, ns=(1_000_000_000, 1_000_000_000))
+    candidate = tmp_path / "01-old.json"
+
+    _, _, already = detect_duplicates([candidate], processed_dir, use_index=True)
+    assert already == [candidate]
+    assert (processed_dir / ".agent0_index.json").exists()
+
+    # Same directory mtime: the cached listing is trusted without re-reading
+    (archive / "02-Hidden.json").write_text("{}", encoding="utf-8")
+    os.utime(archive, ns=(1_000_000_000, 1_000_000_000))
+    hidden = tmp_path / "02-hidden.json"
+    unique, _, _ = detect_duplicates([hidden], processed_dir, use_index=True)
+    assert unique == [hidden]
+
+    # A new file bumps the mtime, so the directory is listed again
+    (archive / "03-New.json").write_text("{}", encoding="utf-8")
+    new = tmp_path / "03-new.json"
+    _, _, already = detect_duplicates([hidden, new], processed_dir, use_index=True)
+    assert already == [hidden, new]
+
+
+def test_duplicate_detection_relists_without_index(tmp_path: Path) -> None:
+    processed_dir = tmp_path / "processed"
+    archive = processed_dir / "2024"
+    archive.mkdir(parents=True)
+    (archive / "01-Old.json").write_text("{}", encoding="utf-8")
+    candidate = tmp_path / "01-old.json"
+
+    _, _, already = detect_duplicates([candidate], processed_dir)
+    assert already == [candidate]
+    assert not (processed_dir / ".agent0_index.json").exists()
+
+    # Even if the directory mtime does not move, a new file is seen
+    os.utime(archive, ns=(1_000_000_000, 1_000_000_000))
+    (archive / "02-Hidden.json").write_text("{}", encoding="utf-8")
+    os.utime(archive, ns=(1_000_000_000, 1_000_000_000))
+    hidden = tmp_path / "02-hidden.json"
+    _, _, already = detect_duplicates([hidden], processed_dir)
+    assert already == [hidden]
@@ -1,6 +1,10 @@
 import unittest
 
-from article_writer import build_gemini_article_prompt
+from article_writer import (
+    _ensure_single_h1_block,
+    build_gemini_article_prompt,
+    convert_to_british_english,
+)
 
 
 class TestArticleWriterPrompt(unittest.TestCase):
@@ -15,5 +19,37 @@ class TestArticleWriterPrompt(unittest.TestCase):
         self.assertIn("https://example.com", prompt["user_message"])
 
 
+class TestBritishEnglish(unittest.TestCase):
+    def test_converts_whole_words_preserving_case(self):
+        text = "The Organization's COLOR program centers on color, not colorful programmes."
+        self.assertEqual(
+            convert_to_british_english(text),
+            "The Organisation's COLOUR programme centres on colour, not colorful programmes.",
+        )
+
+
+class TestSingleH1(unittest.TestCase):
+    def test_keeps_first_h1_and_downgrades_later_ones(self):
+        content = "<h1>Title</h1><p>Intro</p><H1>Second</H1><p>Body</p><h1>Third</h1>"
+        self.assertEqual(
+            _ensure_single_h1_block(content, "Title"),
+            "<h1>Title</h1><p>Intro</p><h2>Second</h2><p>Body</p><h2>Third</h2>",
+        )
+
+    def test_downgrades_stray_close_before_first_h1(self):
+        content = "</H1>\n<h1>T</h1><h1>U</h1>"
+        self.assertEqual(_ensure_single_h1_block(content, "T"), "</h2>\n<h1>T</h1><h2>U</h2>")
+
+    def test_stray_close_is_downgraded_whatever_the_case_of_later_tags(self):
+        content = "</h1>\n<h1>Title</h1><h1>Dup</h1>"
+        expected = "</h2>\n<h1>Title</h1><h2>Dup</h2>"
+        self.assertEqual(_ensure_single_h1_block(content, "Title"), expected)
+        self.assertEqual(_ensure_single_h1_block(content.replace("Dup</h1>", "Dup</H1>"), "Title"), expected)
+
+    def test_adds_h1_block_when_missing(self):
+        result = _ensure_single_h1_block("<p>Body</p>", "Title")
+        self.assertTrue(result.startswith('<!-- wp:heading {"level":1} -->\n<h1>Title</h1>'))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,70 @@
+import hashlib
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import cache_utils
+
+
+class TestCacheUtils(unittest.TestCase):
+    def _patch_paths(self, tmpdir: str) -> Path:
+        db_path = Path(tmpdir) / "run_cache.sqlite"
+        json_path = Path(tmpdir) / "run_cache.json"
+        for name, value in (("CACHE_DB_PATH", db_path), ("CACHE_PATH", json_path)):
+            patcher = patch.object(cache_utils, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return json_path
+
+    def test_cached_results_round_trip_as_copies(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._patch_paths(tmpdir)
+            self.assertIsNone(cache_utils.get_cached_result("abc"))
+            cache_utils.set_cached_result("abc", {"nested": {"x": 1}})
+            first = cache_utils.get_cached_result("abc")
+            first["nested"]["x"] = 2
+            second = cache_utils.get_cached_result("abc")
+            cache_utils.set_cached_result("abc", {"v": 3})
+            third = cache_utils.get_cached_result("abc")
+
+        self.assertEqual(second, {"nested": {"x": 1}})
+        self.assertEqual(third, {"v": 3})
+
+    def test_cached_results_keep_wide_integers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._patch_paths(tmpdir)
+            cache_utils.set_cached_result("abc", {"id": (2**70 + 1)})
+            self.assertEqual(cache_utils.get_cached_result("abc"), {"id": (2**70 + 1)})
+
+    def test_cached_results_keep_non_finite_floats(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._patch_paths(tmpdir)
+            cache_utils.set_cached_result("abc", {"score": float("inf"), "empty": None})
+            self.assertEqual(cache_utils.get_cached_result("abc"), {"score": float("inf"), "empty": None})
+
+    def test_legacy_json_cache_is_migrated(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_path = self._patch_paths(tmpdir)
+            json_path.write_text(json.dumps({"abc": {"v": 1}}), encoding="utf-8")
+            self.assertEqual(cache_utils.get_cached_result("abc"), {"v": 1})
+            self.assertTrue(json_path.exists())
+
+    def test_unwritable_cache_location_disables_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._patch_paths(tmpdir)
+            with patch.object(cache_utils, "CACHE_DB_PATH", Path(tmpdir) / "missing" / "run_cache.sqlite"):
+                cache_utils.set_cached_result("abc", {"v": 1})
+                self.assertIsNone(cache_utils.get_cached_result("abc"))
+
+    def test_compute_file_hash_matches_sha256(self) -> None:
+        data = b"article body " * 100_000
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "article.json"
+            path.write_bytes(data)
+            self.assertEqual(cache_utils.compute_file_hash(str(path)), hashlib.sha256(data).hexdigest())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import config
+
+
+class TestConfig(unittest.TestCase):
+    def setUp(self) -> None:
+        config._load_cached.cache_clear()
+        self.addCleanup(config._load_cached.cache_clear)
+
+    def test_load_config_returns_independent_copies(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.json"
+            path.write_text(json.dumps({"MODEL_ARTICLE": "a", "nested": {"x": 1}}), encoding="utf-8")
+            with patch.object(config, "CONFIG_FILE", path):
+                first = config.load_config()
+                first["nested"]["x"] = 2
+                second = config.load_config()
+
+        self.assertEqual(second["nested"]["x"], 1)
+
+    def test_save_config_invalidates_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.json"
+            path.write_text(json.dumps({"MODEL_ARTICLE": "a"}), encoding="utf-8")
+            with patch.object(config, "CONFIG_FILE", path):
+                self.assertEqual(config.load_config()["MODEL_ARTICLE"], "a")
+                config.save_config({"MODEL_ARTICLE": "b"})
+                self.assertEqual(config.load_config()["MODEL_ARTICLE"], "b")
+
+    def test_save_config_changes_version_for_identical_rewrite(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.json"
+            with patch.object(config, "CONFIG_FILE", path):
+                config.save_config({"MODEL_ARTICLE": "a"})
+                before = config.config_version()
+                stat = path.stat()
+                config.save_config({"MODEL_ARTICLE": "b"})
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                after = config.config_version()
+                self.assertEqual(config.load_config()["MODEL_ARTICLE"], "b")
+
+        self.assertEqual(before[:2], after[:2])
+        self.assertNotEqual(before, after)
+
+    def test_save_config_handles_wide_integers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.json"
+            with patch.object(config, "CONFIG_FILE", path):
+                config.save_config({"BIG": (2**70 + 1)})
+                self.assertEqual(config.load_config()["BIG"], (2**70 + 1))
+
+    def test_loads_json_keeps_negative_wide_integers(self) -> None:
+        self.assertEqual(config.loads_json(b'{"a": -9999999999999999999}'), {"a": -9999999999999999999})
+
+    def test_load_config_accepts_nan(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.json"
+            path.write_text('{"MODEL_ARTICLE": "a", "THRESHOLD": NaN}', encoding="utf-8")
+            with patch.object(config, "CONFIG_FILE", path):
+                loaded = config.load_config()
+
+        self.assertEqual(loaded["MODEL_ARTICLE"], "a")
+        self.assertNotEqual(loaded["THRESHOLD"], loaded["THRESHOLD"])
+
+    def test_save_config_keeps_nan(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "config.json"
+            with patch.object(config, "CONFIG_FILE", path):
+                config.save_config({"THRESHOLD": float("nan"), "LIMIT": float("inf")})
+                loaded = config.load_config()
+
+        self.assertNotEqual(loaded["THRESHOLD"], loaded["THRESHOLD"])
+        self.assertEqual(loaded["LIMIT"], float("inf"))
+
+
+    def test_dumps_json_keeps_nested_non_finite_floats(self) -> None:
+        value = {"scores": [1.0, {"top": float("-inf")}], "empty": None}
+        loaded = json.loads(config.dumps_json(value, indent=True))
+        self.assertEqual(loaded["scores"][1]["top"], float("-inf"))
+        self.assertIsNone(loaded["empty"])
+
+    @unittest.skipIf(config.orjson is None, "orjson not installed")
+    def test_dumps_json_uses_orjson_for_null_and_null_strings(self) -> None:
+        value = {"empty": None, "note": "null", "text": "Barça"}
+        self.assertEqual(config.dumps_json(value), config.orjson.dumps(value))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,10 @@
+import dataclasses
 import json
 import tempfile
 import unittest
 from pathlib import Path
 
-from file_loader import load_article
+from file_loader import Article, load_article
 
 
 class TestFileLoader(unittest.TestCase):
@@ -40,6 +41,33 @@ Body content here.
         self.assertIn("Body content", article.main_content_body)
         self.assertEqual(article.keywords, ["alpha", "beta"])
 
+    def test_load_markdown_strips_html(self):
+        content = """---
+title: Example Title
+---
+<p>First  line<br/>second &amp; third</p><script>var x = 1;</script>
+<!-- note --><div>Closing</div>
+"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "article.md"
+            path.write_text(content, encoding="utf-8")
+            article = load_article(str(path))
+
+        self.assertEqual(article.main_content_body, "First line\nsecond & third\n\nClosing")
+
+    def test_to_dict_matches_asdict(self):
+        article = Article(
+            title="Title",
+            image_urls=["https://example.com/a.jpg"],
+            keywords=["a"],
+            external_references=[{"url": "https://example.com", "tags": ["x"]}],
+        )
+        result = article.to_dict()
+
+        self.assertEqual(result, dataclasses.asdict(article))
+        result["external_references"][0]["tags"].append("y")
+        self.assertEqual(article.external_references[0]["tags"], ["x"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -26,6 +26,23 @@ class TestSourceCredits(unittest.TestCase):
         self.assertEqual(updated.count(">Link to original article</a>"), 1)
         self.assertTrue(updated.rstrip().endswith("<!-- /wp:paragraph -->"))
 
+    def test_finalise_source_credits_removes_block_with_both_labels(self) -> None:
+        source_url = "https://example.com/source"
+        content = (
+            "<!-- wp:paragraph -->\n"
+            "<p>Body text.</p>\n"
+            "<!-- /wp:paragraph -->\n\n"
+            "<!-- wp:paragraph -->\n"
+            f"<p><a href=\"{source_url}\">Source</a></p>\n"
+            f"<p><a href=\"{source_url}\">Link to original article</a></p>\n"
+            "<!-- /wp:paragraph -->\n"
+        )
+        updated = finalise_source_credits(content, source_url, primary_source=None)
+        self.assertEqual(updated.count("<!-- wp:paragraph -->"), 2)
+        self.assertNotIn("<!-- wp:paragraph -->\n\n<!-- /wp:paragraph -->", updated)
+        self.assertEqual(updated.count(">Source</a>"), 0)
+        self.assertEqual(updated.count(">Link to original article</a>"), 1)
+
     def test_finalise_source_credits_no_source_when_primary_reliable(self) -> None:
         source_url = "https://example.com/source"
         primary = {"primary_source": {"url": "https://example.com/primary", "confidence": 0.9}}